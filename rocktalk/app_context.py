@@ -24,6 +24,7 @@ import yaml
 from models.llm import BedrockLLM, LLMInterface
 from models.storage.sqlite import SQLiteChatStorage
 from models.storage.storage_interface import StorageInterface
+from services.bedrock import BedrockService
 from utils.log import ROCKTALK_DIR, logger
 from utils.js import refresh_window
 from yaml.loader import SafeLoader
@@ -47,6 +48,7 @@ class AppContext:
         self._storage = self._init_storage()
         self._llm = self._init_llm()
         self._auth = self._init_auth()
+        self._prefetch_models()
 
         # Initialize state
         self._init_state()
@@ -85,6 +87,17 @@ class AppContext:
         logger.debug("No authentication configuration found")
         return None
 
+    def _prefetch_models(self) -> None:
+        """Start loading the Bedrock model list in the background.
+
+        The settings dialog needs it later; fetching now overlaps the network
+        round trip with the first render.
+        """
+        try:
+            BedrockService().prefetch_foundation_models()
+        except Exception as e:
+            logger.warning(f"Could not start model list prefetch: {e}")
+
     def _init_state(self):
         """Initialize application state variables."""
         # These are session state values that need to be set during initialization
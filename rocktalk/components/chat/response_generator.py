@@ -133,7 +133,7 @@ class ResponseGenerator(Component):
                     from_index=last_human_message.index,
                 )
 
-            st.session_state.user_input_default = last_human_message.to_prompt_return()
+            st.session_state.user_input_default = last_human_message.prompt_return
 
         st.rerun()
 
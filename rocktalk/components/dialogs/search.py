@@ -1,4 +1,5 @@
 import json
+import re
 import time
 import uuid
 from datetime import datetime, timezone
@@ -171,6 +172,11 @@ class SearchInterface:
 
         # Convert wildcards to SQL LIKE syntax
         terms = [term.replace("*", "%") for term in terms]
+        # Same matching as the storage search, for picking out matching messages
+        patterns = [
+            re.compile(".*".join(map(re.escape, term.split("%"))), re.IGNORECASE)
+            for term in terms
+        ]
 
         try:
             # Get matching sessions
@@ -189,7 +195,11 @@ class SearchInterface:
                 matching_messages = [
                     msg
                     for msg in messages
-                    if any(term.lower() in str(msg.content).lower() for term in terms)
+                    if any(
+                        pattern.search(item.text or item.thinking or "")
+                        for item in msg.content
+                        for pattern in patterns
+                    )
                 ]
 
                 results.append(
@@ -274,8 +284,8 @@ class SearchInterface:
         # Show processing message
         with st.spinner("Preparing export data..."):
             export_data = []
-            for session_id in st.session_state.selected_sessions:
-                session = self.ctx.storage.get_session(session_id)
+            sessions = self.ctx.storage.get_sessions(st.session_state.selected_sessions)
+            for session_id, session in sessions.items():
                 messages = self.ctx.storage.get_messages(session_id)
                 export_data.append(
                     ChatExport(session=session, messages=messages).model_dump_json()
@@ -291,18 +301,15 @@ class SearchInterface:
 
     def toggle_sessions_hidden_state(self):
         if st.session_state.selected_sessions:
+            sessions = self.ctx.storage.get_sessions(st.session_state.selected_sessions)
+
             # Count current private status
-            private_count = 0
-            for session_id in st.session_state.selected_sessions:
-                session = self.ctx.storage.get_session(session_id)
-                if session.is_private:
-                    private_count += 1
+            private_count = sum(session.is_private for session in sessions.values())
 
             # Determine new state based on majority
             make_private = private_count < len(st.session_state.selected_sessions) / 2
 
-            for session_id in st.session_state.selected_sessions:
-                session = self.ctx.storage.get_session(session_id)
+            for session in sessions.values():
                 session.is_private = make_private
                 self.ctx.storage.update_session(session)
                 st.session_state.refresh_app = True
@@ -252,8 +252,8 @@ class SettingsManager:
 
     def render_refresh_credentials(self):
         if st.button("Refresh AWS Credentials"):
-            get_cached_aws_credentials()
-            self.ctx.llm.update_config(st.session_state.original_config)
+            get_cached_aws_credentials.clear()
+            self.ctx.llm.refresh_credentials(st.session_state.original_config)
             st.success("Credentials refreshed successfully!")
 
     @staticmethod
@@ -348,7 +348,7 @@ class SettingsManager:
                         )
                         for msg in messages:
                             msg.session_id = new_session.session_id
-                            self.ctx.storage.save_message(msg)
+                        self.ctx.storage.save_messages(messages)
                     success = True
 
             with col2:
@@ -590,7 +590,7 @@ class SettingsManager:
                 # Update session_id for all messages and save them
                 for msg in st.session_state.messages:
                     msg.session_id = new_session.session_id
-                    self.ctx.storage.save_message(message=msg)
+                self.ctx.storage.save_messages(st.session_state.messages)
 
                 # Clear temporary session flag and update UI
                 st.session_state.temporary_session = False
@@ -1081,8 +1081,7 @@ class SettingsManager:
         self.ctx.storage.store_session(import_data.session)
 
         # Store all messages
-        for msg in import_data.messages:
-            self.ctx.storage.save_message(msg)
+        self.ctx.storage.save_messages(import_data.messages)
 
         # Update current session
         st.session_state.current_session_id = import_data.session.session_id
@@ -1,21 +1,27 @@
 import base64
+import hashlib
 import io
-import json
 import random
 import re
+import secrets
 import uuid
 from datetime import datetime, timezone
-from functools import partial
-from typing import Any, Dict, List, Optional, TypeAlias
+from enum import StrEnum
+from functools import cached_property, partial
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, TypeAlias
 
 import streamlit as st
-from langchain.schema import AIMessage, BaseMessage, HumanMessage, SystemMessage
-from PIL.ImageFile import ImageFile
-from pydantic import BaseModel, Field, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    model_validator,
+)
 from streamlit_chat_prompt import FileData, PromptReturn, prompt
-from utils.image_utils import MAX_IMAGE_WIDTH, image_from_b64_image
+from utils.image_utils import thumbnail_from_b64_image
 from utils.js import copy_value_to_clipboard, focus_prompt
-from utils.log import logger
 from utils.streamlit_utils import (
     OnPillsChange,
     PillOptions,
@@ -24,6 +30,10 @@ from utils.streamlit_utils import (
     on_pills_change,
 )
 
+if TYPE_CHECKING:
+    from langchain.schema import BaseMessage
+    from PIL.Image import Image
+
 
 class ThinkingParameters(BaseModel):
     """Parameters for Claude's extended thinking capability.
@@ -105,24 +115,25 @@ class ChatTemplate(BaseModel):
 class ChatContentItem(BaseModel):
     """Content of a chat message, which can be text or other media types."""
 
+    model_config = ConfigDict(extra="ignore")
+
     text: Optional[str] = None
     thinking: Optional[str] = None
     thinking_signature: Optional[str] = None
     redacted_thinking: Optional[str] = None
     image_data: Optional[str] = None
     document_data: Optional[str] = None  # New field for document content
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = Field(default_factory=dict)
 
     @model_validator(mode="after")
     def validate_content(self) -> "ChatContentItem":
         """Validate that at least one content type is provided"""
-        values = self.model_dump()
         content_fields = [
-            values.get("text"),
-            values.get("thinking"),
-            values.get("redacted_thinking"),
-            values.get("image_data"),
-            values.get("document_data"),
+            self.text,
+            self.thinking,
+            self.redacted_thinking,
+            self.image_data,
+            self.document_data,
         ]
 
         # Check if at least one content field is provided
@@ -138,19 +149,108 @@ class ChatContentItem(BaseModel):
 
 ChatContent: TypeAlias = List[ChatContentItem]
 
+# built once, validating stored content doesn't rebuild the list validator per row
+_CHAT_CONTENT_ADAPTER: TypeAdapter[ChatContent] = TypeAdapter(ChatContent)
+
+
+# Render operations for a message, dispatched to streamlit elements by display():
+# ("image", content index), ("document", content index, markdown preview or None),
+# ("warning", message), ("thinking", escaped thinking blocks), ("markdown", text)
+RenderOp: TypeAlias = Tuple[Any, ...]
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _render_ops(
+    content_digest: str, _content: ChatContent
+) -> Tuple[str, Tuple[RenderOp, ...]]:
+    """Plan how to render a message once per content digest.
+
+    Messages are immutable once displayed from history, so reruns can reuse the
+    joined and escaped text, thinking blocks and decoded document previews
+    instead of re-walking the content list.
+
+    Args:
+        content_digest: Digest of the message content, used as the cache key
+        _content: Message content (not hashed by streamlit)
+
+    Returns:
+        Tuple of (raw text, render operations in display order)
+    """
+    text_list: List[str] = []
+    thinking_blocks: List[str] = []
+    media_ops: List[RenderOp] = []
+    for i, item in enumerate(_content):
+        if item.text:
+            text_list.append(item.text)
+        elif item.image_data:
+            media_ops.append(("image", i))
+        elif item.document_data:
+            # display preview for markdown docs
+            preview: Optional[str] = None
+            if item.metadata.get("format", "pdf").lower() == "markdown":
+                try:
+                    preview = base64.b64decode(item.document_data).decode("utf-8")
+                except Exception:
+                    media_ops.append(("warning", "Unable to preview markdown content"))
+            media_ops.append(("document", i, preview))
+        elif item.thinking:
+            thinking_blocks.append(escape_dollarsign(item.thinking))
+        elif item.redacted_thinking:
+            thinking_blocks.append("[Content redacted for safety]")
+    text = "".join(text_list)
+
+    ops: List[RenderOp] = media_ops
+    if thinking_blocks:
+        ops.append(("thinking", tuple(thinking_blocks)))
+    if text:
+        ops.append(("markdown", escape_dollarsign(text)))
+    return text, tuple(ops)
+
+
+class Role(StrEnum):
+    """Role of a chat message sender"""
+
+    USER = "user"
+    ASSISTANT = "assistant"
+    SYSTEM = "system"
+
 
 class ChatMessage(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     message_id: int
     session_id: str
     content: ChatContent = Field(default_factory=list)
-    role: str
+    role: Role
     index: int
     created_at: datetime = Field(default_factory=partial(datetime.now, timezone.utc))
 
+    # converted LangChain messages, keyed by whether thinking is supported
+    _llm_messages: dict[bool, "BaseMessage"] = PrivateAttr(default_factory=dict)
+
+    @cached_property
+    def content_digest(self) -> str:
+        """Digest of the message content, computed once per message.
+
+        Content is never mutated after creation, so this serves as a cheap
+        "has this message changed?" key for caches and widget keys.
+        """
+        return hashlib.blake2b(
+            self.serialize_message_content().encode(), digest_size=16
+        ).hexdigest()
+
+    @cached_property
+    def prompt_return(self) -> PromptReturn:
+        """PromptReturn for this message, built once and reused.
+
+        Used read-only as the default value of prompt widgets, so repeated edit
+        dialogs don't rebuild the FileData list for image-heavy messages.
+        """
+        return self.to_prompt_return()
+
     @st.dialog("Edit Message")
     def edit_message(self):
-        previous_prompt = self.to_prompt_return()
-        logger.debug(f"Editing message: {previous_prompt}")
+        previous_prompt = self.prompt_return
         st.warning(
             "Editing message will re-run conversation from this point and will replace any existing conversation past this point!",
             icon="⚠️",
@@ -193,7 +293,7 @@ class ChatMessage(BaseModel):
 
     @staticmethod
     def create(
-        role: str,
+        role: Role,
         content: List[ChatContentItem],
         index: int,
         session_id: Optional[str] = None,
@@ -223,8 +323,8 @@ class ChatMessage(BaseModel):
 
     def display(self) -> None:
         # Only show edit button for user messages
-        # create uui for this particular message display
-        unique_id = str(uuid.uuid4())
+        # stable id for this message so widget keys survive reruns
+        unique_id = f"{self.index}_{self.content_digest}"
         text: str = ""
         with st.container(
             border=True,
@@ -235,34 +335,31 @@ class ChatMessage(BaseModel):
                 #     text = self.content
                 #     st.markdown(escape_dollarsign(text))
                 if isinstance(self.content, list):
-                    text_list: List[str] = []
-                    thinking_blocks: List[str] = []
-
-                    # First pass: collect thinking blocks and text content
-                    for item in self.content:
-                        if item.text:
-                            text_list.append(item.text)
-                        elif item.image_data:
-                            pil_image: ImageFile = image_from_b64_image(item.image_data)
-                            width: int = pil_image.size[0]
-                            st.image(
-                                image=pil_image,
-                                width=min(width, MAX_IMAGE_WIDTH),
+                    text, render_ops = _render_ops(self.content_digest, self.content)
+
+                    # images and documents first, then thinking, then text
+                    for op in render_ops:
+                        kind = op[0]
+                        if kind == "markdown":
+                            st.markdown(op[1])
+                        elif kind == "thinking":
+                            with st.expander("View reasoning process", expanded=False):
+                                for block in op[1]:
+                                    st.markdown(block)
+                        elif kind == "warning":
+                            st.warning(op[1])
+                        elif kind == "image":
+                            pil_image: Image = thumbnail_from_b64_image(
+                                self.content[op[1]].image_data
                             )
-                        elif item.document_data:
-                            doc_format = item.metadata.get("format", "pdf").lower()
+                            st.image(image=pil_image, width=pil_image.size[0])
+                        elif kind == "document":
+                            item = self.content[op[1]]
                             doc_name = item.metadata.get("name", "document")
 
-                            # display preview for markdown docs
-                            if doc_format == "markdown":
-                                try:
-                                    markdown_content = base64.b64decode(
-                                        item.document_data
-                                    ).decode("utf-8")
-                                    with st.expander("Preview Content"):
-                                        st.markdown(markdown_content)
-                                except Exception:
-                                    st.warning("Unable to preview markdown content")
+                            if op[2] is not None:
+                                with st.expander("Preview Content"):
+                                    st.markdown(op[2])
 
                             # download button documents
                             doc_bytes = io.BytesIO(base64.b64decode(item.document_data))
@@ -271,31 +368,8 @@ class ChatMessage(BaseModel):
                                 data=doc_bytes,
                                 file_name=doc_name,
                                 mime=item.metadata.get("media_type"),
-                                key=f"download_{doc_name}_{uuid.uuid4()}",
+                                key=f"download_{self.message_id}_{unique_id}_{op[1]}",
                             )
-                        elif item.thinking:
-                            thinking_blocks.append(item.thinking)
-                        elif item.redacted_thinking:
-                            thinking_blocks.append("[Content redacted for safety]")
-
-                    # Display thinking blocks first
-                    if thinking_blocks:
-                        with st.expander("View reasoning process", expanded=False):
-                            for block in thinking_blocks:
-                                st.markdown(escape_dollarsign(block))
-
-                    # Then display text content
-                    text = "".join(text_list)
-                    if text:
-                        st.markdown(escape_dollarsign(text))
-
-            message_button_container_key = (
-                f"message_button_container_{self.message_id}_{unique_id}"
-            )
-            message_button_container = st.container(
-                border=False, key=message_button_container_key
-            )
-            with message_button_container:
 
                 message_buttons_key = f"message_buttons_{self.message_id}_{unique_id}"
 
@@ -305,7 +379,7 @@ class ChatMessage(BaseModel):
                         "callback": partial(copy_value_to_clipboard, text),
                     },
                 ]
-                if self.role == "user":
+                if self.role is Role.USER:
                     options_map.insert(
                         0,
                         {
@@ -329,24 +403,50 @@ class ChatMessage(BaseModel):
                     label_visibility="collapsed",
                 )
 
-    def convert_to_llm_message(self) -> BaseMessage:
+    def llm_message(self, thinking_supported: bool) -> "BaseMessage":
+        """LangChain message for this ChatMessage, converted once and reused.
+
+        Content is immutable, so a conversion is cached per thinking_supported
+        value and only redone for the other value.
+
+        Args:
+            thinking_supported: Whether the converting LLM sends thinking blocks
+                to the model.
+        """
+        if thinking_supported not in self._llm_messages:
+            self._llm_messages[thinking_supported] = self.convert_to_llm_message(
+                thinking_supported=thinking_supported
+            )
+        return self._llm_messages[thinking_supported]
+
+    def convert_to_llm_message(
+        self, thinking_supported: Optional[bool] = None
+    ) -> "BaseMessage":
         """Convert ChatMessage to LangChain message format.
 
         Args:
-            message: ChatMessage to convert.
+            thinking_supported: Whether thinking blocks should be sent to the
+                model. Defaults to the current LLM's thinking support.
 
         Returns:
             LangChain message object (either HumanMessage or AIMessage).
         """
+        # langchain pulls in a large import graph, only load it when converting
+        from langchain.schema import AIMessage, HumanMessage, SystemMessage
+
+        if thinking_supported is None:
+            thinking_supported = (
+                st.session_state.app_context.llm.is_thinking_supported()
+            )
+
+        message_class = {
+            Role.USER: HumanMessage,
+            Role.ASSISTANT: AIMessage,
+            Role.SYSTEM: SystemMessage,
+        }[self.role]
+
         if isinstance(self.content, str):
-            if self.role == "system":
-                return SystemMessage(content=self.content)
-            elif self.role == "user":
-                return HumanMessage(content=self.content)
-            elif self.role == "assistant":
-                return AIMessage(content=self.content)
-            else:
-                raise ValueError(f"Invalid role: {self.role}")
+            return message_class(content=self.content)
         else:
             # Handle structured content for Anthropic Claude 3.7 thinking blocks
             content_list: List[Any] = []
@@ -354,7 +454,7 @@ class ChatMessage(BaseModel):
                 if item.text:
                     content_list.append({"type": "text", "text": item.text})
                 elif item.thinking:
-                    if st.session_state.app_context.llm.is_thinking_supported():
+                    if thinking_supported:
                         content_list.append(
                             {
                                 "type": "thinking",
@@ -363,7 +463,7 @@ class ChatMessage(BaseModel):
                             }
                         )
                 elif item.redacted_thinking:
-                    if st.session_state.app_context.llm.is_thinking_supported():
+                    if thinking_supported:
                         content_list.append(
                             {
                                 "type": "redacted_thinking",
@@ -432,12 +532,7 @@ class ChatMessage(BaseModel):
                             }
                         )
 
-            if self.role == "assistant":
-                return AIMessage(content=content_list)
-            elif self.role == "user":
-                return HumanMessage(content=content_list)
-            else:
-                return SystemMessage(content=content_list)
+            return message_class(content=content_list)
 
     @staticmethod
     def from_system_message(
@@ -452,7 +547,7 @@ class ChatMessage(BaseModel):
         return (
             ChatMessage.create(
                 session_id=session_id,
-                role="system",
+                role=Role.SYSTEM,
                 content=[ChatContentItem(text=system_message)],
                 index=-1,
             )
@@ -508,7 +603,7 @@ class ChatMessage(BaseModel):
 
         return ChatMessage.create(
             session_id=session_id,
-            role="user",
+            role=Role.USER,
             content=content_items,
             index=(index if index is not None else len(st.session_state.messages)),
         )
@@ -522,10 +617,6 @@ class ChatMessage(BaseModel):
         text = None
         images: List[FileData] = []
 
-        logger.debug(
-            f"Prompt return raw data from streamlit-chat-prompt: {self.content}"
-        )
-
         if isinstance(self.content, list):
             for item in self.content:
                 if isinstance(item, ChatContentItem):
@@ -559,24 +650,21 @@ class ChatMessage(BaseModel):
 
     def serialize_message_content(self) -> str:
         """Convert a list of ChatContentItem objects to a JSON string for storage."""
-        # Convert each ChatContentItem to a dict
-        serialized_items = [item.model_dump() for item in self.content]
-        return json.dumps(serialized_items)
+        return _CHAT_CONTENT_ADAPTER.dump_json(self.content).decode()
 
     @staticmethod
-    def deserialize_message_content(content_json: str) -> ChatContent:
+    def deserialize_message_content(content_json: str | bytes) -> ChatContent:
         """Convert a JSON string back to a list of ChatContentItem objects."""
-        # Parse the JSON string into a list of dicts
-        content_data = json.loads(content_json)
-
-        # Convert each dict back to a ChatContentItem
-        return [ChatContentItem.model_validate(item) for item in content_data]
+        # Parse and validate in pydantic-core, without building intermediate dicts
+        return _CHAT_CONTENT_ADAPTER.validate_json(content_json)
 
 
 class ChatSession(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     title: str
     config: LLMConfig
-    session_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    session_id: str = Field(default_factory=partial(secrets.token_hex, 16))
     created_at: datetime = Field(default_factory=partial(datetime.now, timezone.utc))
     last_active: datetime = Field(default_factory=partial(datetime.now, timezone.utc))
     is_private: bool = False
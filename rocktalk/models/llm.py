@@ -1,9 +1,10 @@
 import os
-import pprint
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
+from itertools import islice
 from typing import Any, Dict, Iterator, List, Optional, cast
 
 import streamlit as st
@@ -12,7 +13,8 @@ from langchain_aws import ChatBedrockConverse
 from langchain_core.messages.ai import AIMessageChunk, UsageMetadata
 from langchain_core.messages.base import BaseMessageChunk
 from pydantic import BaseModel, Field
-from services.creds import get_cached_aws_credentials
+from services.bedrock import clear_bedrock_clients, get_bedrock_runtime_client
+from services.creds import AwsCredentials, get_cached_aws_credentials
 from utils.log import logger
 from utils.streamlit_utils import escape_dollarsign
 
@@ -22,11 +24,61 @@ from .interfaces import (
     ChatMessage,
     ChatSession,
     LLMConfig,
+    Role,
 )
 from .rate_limiter import TokenRateLimiter
 from .storage.storage_interface import StorageInterface
 
 
+@lru_cache(maxsize=8)
+def _system_llm_message(system_prompt: str) -> BaseMessage:
+    """Convert a system prompt to a LangChain message, reused across requests"""
+    system_message = cast(
+        ChatMessage, ChatMessage.from_system_message(system_message=system_prompt)
+    )
+    return system_message.convert_to_llm_message(thinking_supported=False)
+
+
+def _env_tokens_per_minute() -> Optional[int]:
+    """Read the BEDROCK_TOKENS_PER_MINUTE rate limit override, if set"""
+    env_rate_limit = os.getenv("BEDROCK_TOKENS_PER_MINUTE")
+    if not env_rate_limit:
+        return None
+    try:
+        return int(env_rate_limit)
+    except ValueError:
+        logger.warning(f"Invalid BEDROCK_TOKENS_PER_MINUTE value: {env_rate_limit}")
+        return None
+
+
+ENV_TOKENS_PER_MINUTE: Optional[int] = _env_tokens_per_minute()
+
+
+def _title_context(messages: List[ChatMessage]) -> List[BaseMessage]:
+    """Build a small LLM context for session titling.
+
+    The opening exchange is enough to name a conversation, so only the text of
+    the first TITLE_CONTEXT_MESSAGES non-system messages is kept, each
+    truncated to TITLE_CONTEXT_MAX_CHARS. Images, documents and thinking
+    blocks are dropped.
+
+    Args:
+        messages: Conversation messages in order
+
+    Returns:
+        LangChain messages to prepend to the title prompt
+    """
+    title_context: List[BaseMessage] = []
+    conversation = (msg for msg in messages if msg.role is not Role.SYSTEM)
+    for msg in islice(conversation, TITLE_CONTEXT_MESSAGES):
+        text = "\n".join(item.text for item in msg.content if item.text)
+        if not text:
+            continue
+        message_class = HumanMessage if msg.role is Role.USER else AIMessage
+        title_context.append(message_class(content=text[:TITLE_CONTEXT_MAX_CHARS]))
+    return title_context
+
+
 class TurnState(Enum):
     """Enum representing the current turn state in the conversation.
 
@@ -41,6 +93,14 @@ class TurnState(Enum):
     COMPLETE = "complete"
 
 
+# Approximate input token cost of a single image, independent of its encoded size
+IMAGE_TOKEN_EST = 1200
+
+# Session titling only looks at the opening exchange
+TITLE_CONTEXT_MESSAGES = 2
+TITLE_CONTEXT_MAX_CHARS = 1000
+TITLE_MAX_TOKENS = 16
+
 MODEL_CONTEXT_LIMITS = {
     # Claude models
     # Claude 3.5 models
@@ -114,6 +174,8 @@ class LLMInterface(ABC):
     @abstractmethod
     def update_config(self, config: Optional[LLMConfig] = None) -> None: ...
     @abstractmethod
+    def refresh_credentials(self, config: Optional[LLMConfig] = None) -> None: ...
+    @abstractmethod
     def get_config(self) -> LLMConfig: ...
     @abstractmethod
     def is_thinking_supported(self) -> bool: ...
@@ -123,6 +185,14 @@ class LLMInterface(ABC):
     def get_rate_limiter(self) -> Optional[TokenRateLimiter]:
         return None
 
+    def invoke_for_title(self, input: List[BaseMessage]) -> BaseMessage:
+        """Invoke the model to generate a session title.
+
+        Implementations may route this to a cheaper, short-output model
+        configuration.
+        """
+        return self.invoke(input)
+
     def get_state_system_message(self) -> ChatMessage | None:
         if self.get_config().system:
             return ChatMessage.from_system_message(
@@ -140,23 +210,25 @@ class LLMInterface(ABC):
         Returns:
             List of BaseMessage objects in LLM format.
         """
-        system_message: ChatMessage | None
+        system_prompt: Optional[str]
         conversation_messages: List[ChatMessage]
         if session:
-            system_message = ChatMessage.from_system_message(
-                system_message=session.config.system,
-                session_id=session.session_id,
-            )
+            system_prompt = session.config.system
             conversation_messages = self._storage.get_messages(session.session_id)
         else:
-            system_message = self.get_state_system_message()
+            system_prompt = self.get_config().system
             # Use session_state.messages directly for now as it's part of the component state
             conversation_messages = st.session_state.messages
 
-        messages: List[ChatMessage] = [system_message] if system_message else []
-        messages.extend(conversation_messages)
-
-        langchain_messages = [msg.convert_to_llm_message() for msg in messages]
+        # ChatMessage caches its converted LangChain message, so only new
+        # messages are converted here
+        thinking_supported = self.is_thinking_supported()
+        langchain_messages: List[BaseMessage] = (
+            [_system_llm_message(system_prompt)] if system_prompt else []
+        )
+        langchain_messages.extend(
+            msg.llm_message(thinking_supported) for msg in conversation_messages
+        )
 
         return langchain_messages
 
@@ -176,11 +248,17 @@ class LLMInterface(ABC):
             More details are useful, but space is limited to show this summary, so ideally 2-4 words.
             Be direct and concise, no explanations needed. If there are missing messages, do the best you can to keep the summary short."""
         )
-        title_response: BaseMessage = self.invoke(
-            [
-                *self.convert_messages_to_llm_format(session=session),
-                title_prompt,
-            ]
+        conversation_messages: List[ChatMessage] = (
+            self._storage.get_messages(session.session_id)
+            if session
+            else st.session_state.messages
+        )
+        title_context = _title_context(conversation_messages)
+        if not title_context:
+            return f"Chat {datetime.now(timezone.utc)}"
+
+        title_response: BaseMessage = self.invoke_for_title(
+            [*title_context, title_prompt]
         )
         title_content: str | list[str | dict] = title_response.content
 
@@ -195,42 +273,33 @@ class LLMInterface(ABC):
 
             title = escape_dollarsign("".join(text_parts).strip('" \n').strip())
         else:
-            logger.warning(f"Unexpected generated title response: {title_content}")
+            logger.warning("Unexpected generated title response: %s", title_content)
             return f"Chat {datetime.now(timezone.utc)}"
 
         # Fallback to timestamp if we get an empty or invalid response
         if not title:
             title = f"Chat {datetime.now(timezone.utc)}"
 
-        logger.info(f"New session title: {title}")
+        logger.info("New session title: %s", title)
         return title
 
 
 class BedrockLLM(LLMInterface):
     def _init_rate_limiter(self) -> None:
         """Initialize the rate limiter using config or environment values"""
-        # Get rate limit from config or environment
-        config_rate_limit = self.get_config().rate_limit
-        env_rate_limit = os.getenv("BEDROCK_TOKENS_PER_MINUTE")
-
         # Environment variable overrides config if present
-        if env_rate_limit:
-            try:
-                tokens_per_minute = int(env_rate_limit)
-                logger.debug(
-                    f"Using environment token rate limit: {tokens_per_minute} tokens/min"
-                )
-            except ValueError:
-                logger.warning(
-                    f"Invalid BEDROCK_TOKENS_PER_MINUTE value: {env_rate_limit}"
-                )
-                tokens_per_minute = config_rate_limit
-        else:
-            tokens_per_minute = config_rate_limit
-            logger.debug(
-                f"Using configured token rate limit: {tokens_per_minute} tokens/min"
-            )
+        tokens_per_minute = (
+            ENV_TOKENS_PER_MINUTE
+            if ENV_TOKENS_PER_MINUTE is not None
+            else self.get_config().rate_limit
+        )
+
+        # Keep the existing limiter, and its usage window, if the limit is unchanged
+        rate_limiter: TokenRateLimiter | None = getattr(self, "_rate_limiter", None)
+        if rate_limiter and rate_limiter.tokens_per_minute == tokens_per_minute:
+            return
 
+        logger.debug("Using token rate limit: %s tokens/min", tokens_per_minute)
         self._rate_limiter = TokenRateLimiter(tokens_per_minute=tokens_per_minute)
 
     def get_rate_limiter(self) -> TokenRateLimiter:
@@ -243,6 +312,16 @@ class BedrockLLM(LLMInterface):
             self._config = self._storage.get_default_template().config
         self._update_llm()
 
+    def refresh_credentials(self, config: Optional[LLMConfig] = None) -> None:
+        """Apply config like update_config, rebuilding the Bedrock clients and
+        LLM instances so newly resolved AWS credentials are used"""
+        clear_bedrock_clients()
+        if config:
+            self._config = config.model_copy(deep=True)
+        else:
+            self._config = self._storage.get_default_template().config
+        self._update_llm(rebuild=True)
+
     def get_config(self) -> LLMConfig:
         return self._config
 
@@ -256,7 +335,13 @@ class BedrockLLM(LLMInterface):
         # TODO list models where images are supported? expand to other types like documents, audio, etc.
         return True
 
-    def _update_llm(self) -> None:
+    def _update_llm(self, rebuild: bool = False) -> None:
+        """Apply the current config to the LLM instances
+
+        Args:
+            rebuild: Create new LLM instances even if the model and client are
+                unchanged
+        """
         additional_model_request_fields: Dict[str, Any] = {}
 
         # Handle thinking parameters for Claude 3.7 Sonnet
@@ -290,34 +375,79 @@ class BedrockLLM(LLMInterface):
         region_name = (
             creds.aws_region if creds else os.getenv("AWS_REGION", "us-west-2")
         )
+        client = get_bedrock_runtime_client(region_name=region_name, creds=creds)
+
+        sampling_params: Dict[str, Any] = dict(
+            temperature=temperature,
+            max_tokens=self._config.parameters.max_output_tokens,
+            stop_sequences=self._config.stop_sequences,
+            top_p=top_p,
+            additional_model_request_fields=additional_model_request_fields,
+        )
+
+        llm: ChatBedrockConverse | None = getattr(self, "_llm", None)
+        if (
+            not rebuild
+            and llm is not None
+            and llm.client is client
+            and llm.model_id == self._config.bedrock_model_id
+        ):
+            # Same model and client, only the sampling parameters changed
+            for name, value in sampling_params.items():
+                setattr(llm, name, value)
+        else:
+            self._llm = self._create_llm(
+                client=client, creds=creds, region_name=region_name, **sampling_params
+            )
+            # Titles only need a few words, so they get their own short, greedy
+            # instance without thinking enabled
+            self._title_llm = self._create_llm(
+                client=client,
+                creds=creds,
+                region_name=region_name,
+                temperature=0,
+                max_tokens=TITLE_MAX_TOKENS,
+            )
+        self._init_rate_limiter()  # Re-initialize rate limiter when config changes
+
+    def _create_llm(
+        self,
+        client: Any,
+        creds: Optional[AwsCredentials],
+        region_name: str,
+        **params: Any,
+    ) -> ChatBedrockConverse:
+        """Create a ChatBedrockConverse for the configured model.
 
+        Args:
+            client: Shared bedrock-runtime client
+            creds: Credentials from Streamlit secrets, or None to let boto3
+                manage credentials
+            region_name: AWS region
+            **params: Sampling parameters passed to ChatBedrockConverse
+
+        Returns:
+            ChatBedrockConverse instance
+        """
         if creds:
-            self._llm = ChatBedrockConverse(
+            return ChatBedrockConverse(
+                client=client,
                 region_name=region_name,
                 model=self._config.bedrock_model_id,
-                temperature=temperature,
-                max_tokens=self._config.parameters.max_output_tokens,
-                stop=self._config.stop_sequences,
-                top_p=top_p,
-                additional_model_request_fields=additional_model_request_fields,
                 aws_access_key_id=creds.aws_access_key_id,
                 aws_secret_access_key=creds.aws_secret_access_key,
                 aws_session_token=(
                     creds.aws_session_token if creds.aws_session_token else None
                 ),
+                **params,
             )
-        else:
-            # Let boto3 manage credentials
-            self._llm = ChatBedrockConverse(
-                region_name=region_name,
-                model=self._config.bedrock_model_id,
-                temperature=temperature,
-                max_tokens=self._config.parameters.max_output_tokens,
-                stop=self._config.stop_sequences,
-                top_p=top_p,
-                additional_model_request_fields=additional_model_request_fields,
-            )
-        self._init_rate_limiter()  # Re-initialize rate limiter when config changes
+        # Let boto3 manage credentials
+        return ChatBedrockConverse(
+            client=client,
+            region_name=region_name,
+            model=self._config.bedrock_model_id,
+            **params,
+        )
 
     def _estimate_tokens(self, messages: List[BaseMessage]) -> int:
         """Estimate the number of tokens for input messages.
@@ -328,9 +458,26 @@ class BedrockLLM(LLMInterface):
         Returns:
             Estimated input token count
         """
-        # Simple estimation: ~4 chars per token
-        input_text = " ".join(str(msg.content) for msg in messages)
-        input_tokens = len(input_text) // 4
+        # Simple estimation: ~4 chars per token. Images are counted at a fixed
+        # cost instead of by the length of their base64 payload.
+        total_chars = 0
+        for msg in messages:
+            content = msg.content
+            if isinstance(content, str):
+                total_chars += len(content)
+                continue
+            for item in content:
+                if isinstance(item, str):
+                    total_chars += len(item)
+                elif item.get("type") == "text":
+                    total_chars += len(item.get("text", ""))
+                elif item.get("type") == "thinking":
+                    total_chars += len(item.get("thinking", ""))
+                elif item.get("type") == "image":
+                    total_chars += IMAGE_TOKEN_EST * 4
+                else:
+                    total_chars += len(str(item))
+        input_tokens = total_chars // 4
 
         # Add safety margin (30%)
         return int(input_tokens * 1.3)
@@ -595,9 +742,11 @@ class BedrockLLM(LLMInterface):
 
         # Track state
         usage_data: UsageMetadata | None = None
-        current_thinking_block = ""
+        # chunks are collected and joined once the stream ends, repeated string
+        # concatenation would copy the whole reply on every chunk
+        thinking_chunks: List[str] = []
         current_thinking_signature: str | None = None
-        current_text_block = ""
+        text_chunks: List[str] = []
         all_content_items: ChatContent = []
 
         try:
@@ -605,20 +754,17 @@ class BedrockLLM(LLMInterface):
             for chunk in self._llm.stream(input=input):
                 chunk = cast(AIMessageChunk, chunk)
                 # logger.info(f"Chunk received: {pprint.pformat(chunk)}")
-                # Extract usage data if available
-                if chunk.usage_metadata:
-                    usage_data = chunk.usage_metadata
 
                 # Process content
                 if isinstance(chunk.content, str):
                     # Simple text chunk
-                    current_text_block += chunk.content
                     yield {
                         "content": chunk.content,
                         "type": "text",
                         "is_thinking_block": False,
                         "done": False,
                     }
+                    text_chunks.append(chunk.content)
                 elif isinstance(chunk.content, list):
                     # Structured content
                     for item in chunk.content:
@@ -630,7 +776,7 @@ class BedrockLLM(LLMInterface):
                                 )
 
                                 if thinking_chunk:
-                                    current_thinking_block += thinking_chunk
+                                    thinking_chunks.append(thinking_chunk)
 
                                 if item.get("reasoning_content", {}).get("signature"):
                                     current_thinking_signature = item[
@@ -647,13 +793,20 @@ class BedrockLLM(LLMInterface):
                             elif item.get("type") == "text":
                                 # Accumulate text content
                                 text = item.get("text", "")
-                                current_text_block += text
                                 yield {
                                     "content": text,
                                     "type": "text",
                                     "is_thinking_block": False,
                                     "done": False,
                                 }
+                                text_chunks.append(text)
+
+                # Usage data is only reported on the final chunk of the stream
+                if chunk.usage_metadata:
+                    usage_data = chunk.usage_metadata
+
+            current_thinking_block = "".join(thinking_chunks)
+            current_text_block = "".join(text_chunks)
 
             # Ensure we save accumulated content even if there were no empty chunks
             # Add thinking block if we have accumulated content
@@ -675,7 +828,7 @@ class BedrockLLM(LLMInterface):
                 current_text_block=current_text_block,
                 all_content_items=all_content_items,
             )
-            logger.debug(f"Streaming complete: {streaming_output}")
+            logger.debug("Streaming complete: %s", streaming_output)
 
             # Send final completion chunk
             yield {
@@ -689,15 +842,13 @@ class BedrockLLM(LLMInterface):
             # After streaming completes, save the full message if not temporary
             if all_content_items:
                 assistant_message = ChatMessage.create(
-                    role="assistant",
+                    role=Role.ASSISTANT,
                     content=all_content_items,
                     index=len(st.session_state.messages),
                     session_id=st.session_state.get("current_session_id", ""),
                 )
 
-                logger.info(
-                    f"Saving assistant message: {pprint.pformat(assistant_message)}"
-                )
+                logger.debug("Saving assistant message: %s", assistant_message)
 
                 # Store in session state
                 st.session_state.messages.append(assistant_message)
@@ -711,13 +862,22 @@ class BedrockLLM(LLMInterface):
             # After stream completes (or errors), extract and update token usage
             self.handle_usage_data(usage_data)
 
+    def invoke_for_title(self, input: List[BaseMessage]) -> BaseMessage:
+        """Invoke the dedicated titling model with rate limiting"""
+        self.pause_for_rate_limit(input)
+
+        response: AIMessage = cast(AIMessage, self._title_llm.invoke(input=input))
+        self.handle_usage_data(response.usage_metadata)
+
+        return response
+
     def invoke(self, input: list[BaseMessage]) -> AIMessage:
         """Invoke the model with rate limiting"""
         self.pause_for_rate_limit(input)
 
         # Get response
         response: AIMessage = cast(AIMessage, self._llm.invoke(input=input))
-        logger.info(f"Response: {pprint.pformat(response)}")
+        logger.debug("Response: %s", response)
 
         # Extract token usage
         self.handle_usage_data(response.usage_metadata)
@@ -1,10 +1,10 @@
+import time
 from collections import deque
-from datetime import datetime, timedelta, timezone
 from typing import Deque
 
 
 class TokenRateLimiter:
-    """Manages token rate limiting for LLM API calls using datetime objects"""
+    """Manages token rate limiting for LLM API calls over a sliding window"""
 
     def __init__(self, tokens_per_minute: int = 100000):
         """Initialize the rate limiter
@@ -13,10 +13,23 @@ class TokenRateLimiter:
             tokens_per_minute: Maximum tokens to allow per minute
         """
         self.tokens_per_minute = tokens_per_minute
-        self.usage_window: Deque[tuple[datetime, int]] = (
+        self.usage_window: Deque[tuple[float, int]] = (
             deque()
-        )  # (timestamp, token_count)
-        self.window_duration = timedelta(minutes=1)
+        )  # (monotonic timestamp, token_count)
+        self.window_duration: float = 60.0  # seconds
+        # Sum of token counts in usage_window, kept in step with it
+        self._window_tokens: int = 0
+
+    def _expire(self, now: float) -> None:
+        """Drop entries older than the window and subtract them from the total
+
+        Args:
+            now: Current time.monotonic() value
+        """
+        cutoff = now - self.window_duration
+        while self.usage_window and self.usage_window[0][0] < cutoff:
+            _, tokens = self.usage_window.popleft()
+            self._window_tokens -= tokens
 
     def update_usage(self, token_count: int) -> None:
         """Record token usage
@@ -24,16 +37,12 @@ class TokenRateLimiter:
         Args:
             token_count: Number of tokens consumed
         """
-        now = datetime.now(timezone.utc)
-
-        # Remove entries older than our window
-        while (
-            self.usage_window and (now - self.usage_window[0][0]) > self.window_duration
-        ):
-            self.usage_window.popleft()
+        now = time.monotonic()
+        self._expire(now)
 
         # Add current usage
         self.usage_window.append((now, token_count))
+        self._window_tokens += token_count
 
     def check_rate_limit(self, estimated_tokens: int) -> tuple[bool, float]:
         """Check if the request would exceed the rate limit
@@ -44,41 +53,24 @@ class TokenRateLimiter:
         Returns:
             Tuple of (is_allowed, wait_time_seconds)
         """
-        now = datetime.now(timezone.utc)
-
-        # Clean up old entries
-        while (
-            self.usage_window and (now - self.usage_window[0][0]) > self.window_duration
-        ):
-            self.usage_window.popleft()
-
-        # Calculate current usage in the time window
-        current_usage = sum(tokens for _, tokens in self.usage_window)
+        now = time.monotonic()
+        self._expire(now)
 
         # If adding the new estimated tokens would exceed the limit
-        if current_usage + estimated_tokens > self.tokens_per_minute:
+        if self._window_tokens + estimated_tokens > self.tokens_per_minute:
             # Calculate time to wait until we're under limit
             if self.usage_window:
                 # Wait until oldest entry falls out of the window
                 oldest_entry_time = self.usage_window[0][0]
-                wait_time = (
-                    oldest_entry_time + self.window_duration - now
-                ).total_seconds()
+                wait_time = oldest_entry_time + self.window_duration - now
                 return False, max(0, wait_time)
 
         return True, 0
 
     def get_current_usage(self) -> int:
         """Get the current token usage within the window"""
-        now = datetime.now(timezone.utc)
-
-        # Clean up old entries
-        while (
-            self.usage_window and (now - self.usage_window[0][0]) > self.window_duration
-        ):
-            self.usage_window.popleft()
-
-        return sum(tokens for _, tokens in self.usage_window)
+        self._expire(time.monotonic())
+        return self._window_tokens
 
     def get_usage_percentage(self) -> float:
         """Get the current usage as a percentage of the limit"""
@@ -1,27 +1,191 @@
 import json
+import queue
+import re
+import secrets
 import sqlite3
 from contextlib import contextmanager
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from models.interfaces import ChatMessage, ChatSession, ChatTemplate, LLMConfig
-from utils.datetime_utils import format_datetime, parse_datetime
+from utils.datetime_utils import (
+    MICROSECOND,
+    format_datetime,
+    from_epoch_micros,
+    parse_datetime,
+    to_epoch_micros,
+)
 from utils.log import logger
 
 from .storage_interface import SearchOperator, StorageInterface
 
+# Searchable text of a message: the text and thinking of each content item
+MESSAGE_SEARCH_TEXT_SQL = """
+    COALESCE(
+        (
+            SELECT group_concat(
+                COALESCE(json_extract(items.value, '$.text'), '')
+                || char(10)
+                || COALESCE(json_extract(items.value, '$.thinking'), ''),
+                char(10)
+            )
+            FROM json_each({content}) AS items
+        ),
+        ''
+    )
+"""
+
+
+# Applied to every new connection. WAL lets readers proceed during writes and,
+# with synchronous=NORMAL, commits no longer fsync a rollback journal.
+# page_size only takes effect on a new, empty database and must precede the
+# switch to WAL; existing databases keep their page size.
+CONNECTION_PRAGMAS = (
+    "page_size=8192",
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-20000",
+)
+
+# Column order of the tuple rows _deserialize_message unpacks
+MESSAGE_COLUMNS = "message_id, session_id, role, content, message_index, timestamp"
+
+# Columns _deserialize_session reads; the materialized activity columns are
+# only used for filtering and ordering
+SESSION_COLUMNS = (
+    "session_id, title, created_at, last_active, config, is_private, "
+    "input_tokens_used, output_tokens_used"
+)
+
+# Rows fetched per round trip when streaming a session's messages
+MESSAGE_FETCH_SIZE = 256
+
+# Sessions whose messages span more than this are flagged as long_session
+SHORT_SESSION_SPAN = timedelta(days=1)
+
+# Whether a session row spans more than SHORT_SESSION_SPAN. Timestamps are
+# stored as integer microseconds since the epoch (schema v8+).
+LONG_SESSION_SQL = f"""
+    COALESCE(
+        last_message - first_message > {SHORT_SESSION_SPAN // MICROSECOND},
+        0
+    )
+"""
+
+# The same check for the UTC text timestamps stored before schema v8, with the
+# offset suffix julianday() can't parse dropped. Only used by the v5 migration.
+_LONG_SESSION_TEXT_SQL = f"""
+    COALESCE(
+        julianday(substr(last_message, 1, 26))
+        - julianday(substr(first_message, 1, 26))
+        > {SHORT_SESSION_SPAN.days},
+        0
+    )
+"""
+
+# Triggers keeping the sessions activity span columns in step with messages,
+# formatted with the long_session expression for the stored timestamp type
+SPAN_TRIGGERS_SQL = """
+    CREATE TRIGGER IF NOT EXISTS sessions_span_insert
+    AFTER INSERT ON messages BEGIN
+        UPDATE sessions SET
+            first_message = MIN(
+                COALESCE(first_message, NEW.timestamp), NEW.timestamp
+            ),
+            last_message = MAX(
+                COALESCE(last_message, NEW.timestamp), NEW.timestamp
+            )
+        WHERE session_id = NEW.session_id;
+        UPDATE sessions SET long_session = {long_session}
+        WHERE session_id = NEW.session_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS sessions_span_delete
+    AFTER DELETE ON messages BEGIN
+        UPDATE sessions SET
+            first_message = (
+                SELECT MIN(timestamp) FROM messages
+                WHERE session_id = OLD.session_id
+            ),
+            last_message = (
+                SELECT MAX(timestamp) FROM messages
+                WHERE session_id = OLD.session_id
+            )
+        WHERE session_id = OLD.session_id;
+        UPDATE sessions SET long_session = {long_session}
+        WHERE session_id = OLD.session_id;
+    END;
+"""
+
+# Recompute the span columns of every session from its messages
+SPAN_BACKFILL_SQL = """
+    UPDATE sessions SET
+        first_message = (
+            SELECT MIN(timestamp) FROM messages
+            WHERE messages.session_id = sessions.session_id
+        ),
+        last_message = (
+            SELECT MAX(timestamp) FROM messages
+            WHERE messages.session_id = sessions.session_id
+        );
+    UPDATE sessions SET long_session = {long_session};
+"""
+
+
+def _trigram_indexable(term: str) -> bool:
+    """Whether the trigram FTS index answers LIKE '%term%' correctly
+
+    SQLite 3.40's trigram tokenizer measures the literal runs of a LIKE pattern
+    in bytes, so a run of one or two multi-byte characters (e.g. "漢字") is
+    looked up as a trigram and matches nothing. Runs under three bytes fall
+    back to a scan inside FTS5 and are fine.
+    """
+    return all(
+        len(run) >= 3 or len(run.encode()) < 3 for run in re.split("[%_]", term)
+    )
+
+
+def _execute_script(conn: sqlite3.Cursor, script: str) -> None:
+    """Run a multi-statement SQL script one statement at a time
+
+    Unlike executescript, which first commits any open transaction, this keeps
+    the statements inside the caller's write transaction.
+    """
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+    if statement.strip():
+        conn.execute(statement)
+
 
 class SQLiteChatStorage(StorageInterface):
     def __init__(self, db_path: str = "chat_database.db") -> None:
-        # Ensure database directory exists
-        Path(db_path).parent.mkdir(exist_ok=True, parents=True)
         self.db_path = db_path
+        self._in_memory = db_path == ":memory:"
+        if self._in_memory:
+            # Each plain ":memory:" connection is a separate database, so pooled
+            # connections share one named in-memory database instead
+            self._database = (
+                f"file:rocktalk-{secrets.token_hex(8)}?mode=memory&cache=shared"
+            )
+        else:
+            # Ensure database directory exists
+            Path(db_path).parent.mkdir(exist_ok=True, parents=True)
+            self._database = db_path
+        # Idle connections, reused across calls and threads instead of
+        # reconnecting for every query
+        self._pool: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
         self.init_db()
 
     def _migrate_db(self) -> None:
         """Handle database migrations"""
-        with self.get_connection() as conn:
+        with self.get_connection(write=True) as conn:
             # Check for schema version table
             cursor = conn.execute(
                 """
@@ -77,6 +241,33 @@ class SQLiteChatStorage(StorageInterface):
             if current_version < 3 and target_version >= 3:
                 self._migrate_to_v3(conn)
 
+            if current_version < 4 and target_version >= 4:
+                self._migrate_to_v4(conn)
+
+            if current_version < 5 and target_version >= 5:
+                self._migrate_to_v5(conn)
+
+            if current_version < 6 and target_version >= 6:
+                self._migrate_to_v6(conn)
+
+            if current_version < 7 and target_version >= 7:
+                self._migrate_to_v7(conn)
+
+            if current_version < 8 and target_version >= 8:
+                self._migrate_to_v8(conn)
+
+            if current_version < 9 and target_version >= 9:
+                self._migrate_to_v9(conn)
+
+            if current_version < 10 and target_version >= 10:
+                self._migrate_to_v10(conn)
+
+            if current_version < 11 and target_version >= 11:
+                self._migrate_to_v11(conn)
+
+            if current_version < 12 and target_version >= 12:
+                self._migrate_to_v12(conn)
+
     def _migrate_to_v1(self, conn) -> None:
         """Migration for version 1: Adding session columns"""
         logger.info("Migrating database to schema version 1")
@@ -294,38 +485,471 @@ class SQLiteChatStorage(StorageInterface):
         except Exception as e:
             logger.error(f"Migration to v3 failed: {str(e)}")
             raise e
+
+    def _migrate_to_v4(self, conn) -> None:
+        """Migration for version 4: Full-text search indexes
+
+        Titles and message text are mirrored into FTS5 tables using the trigram
+        tokenizer, which serves the substring LIKE patterns used by search from
+        the index. Triggers keep both tables in sync.
+        """
+        logger.info("Migrating database to schema version 4")
+
+        _execute_script(
+            conn,
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                body,
+                session_id UNINDEXED,
+                tokenize='trigram'
+            );
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS sessions_fts USING fts5(
+                title,
+                session_id UNINDEXED,
+                tokenize='trigram'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS messages_fts_insert
+            AFTER INSERT ON messages BEGIN
+                INSERT INTO messages_fts (rowid, body, session_id)
+                VALUES (
+                    NEW.message_id,
+                    {MESSAGE_SEARCH_TEXT_SQL.format(content="NEW.content")},
+                    NEW.session_id
+                );
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS messages_fts_update
+            AFTER UPDATE OF content, session_id ON messages BEGIN
+                DELETE FROM messages_fts WHERE rowid = OLD.message_id;
+                INSERT INTO messages_fts (rowid, body, session_id)
+                VALUES (
+                    NEW.message_id,
+                    {MESSAGE_SEARCH_TEXT_SQL.format(content="NEW.content")},
+                    NEW.session_id
+                );
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS messages_fts_delete
+            AFTER DELETE ON messages BEGIN
+                DELETE FROM messages_fts WHERE rowid = OLD.message_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS sessions_fts_insert
+            AFTER INSERT ON sessions BEGIN
+                INSERT INTO sessions_fts (title, session_id)
+                VALUES (NEW.title, NEW.session_id);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS sessions_fts_update
+            AFTER UPDATE OF title ON sessions BEGIN
+                UPDATE sessions_fts SET title = NEW.title
+                WHERE session_id = OLD.session_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS sessions_fts_delete
+            AFTER DELETE ON sessions BEGIN
+                DELETE FROM sessions_fts WHERE session_id = OLD.session_id;
+            END;
+
+            DELETE FROM messages_fts;
+            INSERT INTO messages_fts (rowid, body, session_id)
+            SELECT
+                message_id,
+                {MESSAGE_SEARCH_TEXT_SQL.format(content="messages.content")},
+                session_id
+            FROM messages;
+
+            DELETE FROM sessions_fts;
+            INSERT INTO sessions_fts (title, session_id)
+            SELECT title, session_id FROM sessions;
+            """,
+        )
+
+        # Update schema version
+        conn.execute(
+            """
+            INSERT INTO schema_version (version, applied_at)
+            VALUES (4, ?)
+            """,
+            (format_datetime(datetime.now(timezone.utc)),),
+        )
+
+    def _migrate_to_v5(self, conn) -> None:
+        """Migration for version 5: Materialized session activity span
+
+        Sessions store the timestamps of their first and last messages, kept
+        up to date by triggers on messages. first_message <= last_message
+        always holds, and sessions spanning more than SHORT_SESSION_SPAN are
+        flagged with long_session. Together these let date range queries use
+        a bounded index range on first_message for the (common) short
+        sessions and a small partial index for the long ones.
+        """
+        logger.info("Migrating database to schema version 5")
+
+        for column, definition in (
+            ("first_message", "TIMESTAMP"),
+            ("last_message", "TIMESTAMP"),
+            ("long_session", "BOOLEAN NOT NULL DEFAULT 0"),
+        ):
+            cursor = conn.execute(
+                "SELECT name FROM pragma_table_info('sessions') WHERE name = ?",
+                (column,),
+            )
+            if not cursor.fetchone():
+                logger.info(f"Adding {column} column to sessions table")
+                conn.execute(f"ALTER TABLE sessions ADD COLUMN {column} {definition}")
+
+        _execute_script(
+            conn,
+            f"""
+            CREATE INDEX IF NOT EXISTS idx_messages_session_timestamp
+            ON messages(session_id, timestamp);
+
+            CREATE INDEX IF NOT EXISTS idx_sessions_first_last
+            ON sessions(first_message, last_message);
+
+            CREATE INDEX IF NOT EXISTS idx_sessions_long_last_message
+            ON sessions(last_message) WHERE long_session = 1;
+
+            {SPAN_TRIGGERS_SQL.format(long_session=_LONG_SESSION_TEXT_SQL)}
+
+            {SPAN_BACKFILL_SQL.format(long_session=_LONG_SESSION_TEXT_SQL)}
+            """,
+        )
+
+        # Update schema version
+        conn.execute(
+            """
+            INSERT INTO schema_version (version, applied_at)
+            VALUES (5, ?)
+            """,
+            (format_datetime(datetime.now(timezone.utc)),),
+        )
+
+    def _migrate_to_v6(self, conn) -> None:
+        """Migration for version 6: Drop duplicate indexes
+
+        idx_messages_session_id and idx_templates_name covered the same columns
+        as the indexes SQLite already maintains for the UNIQUE constraints on
+        messages(session_id, message_index) and templates(name), so every write
+        paid for two identical b-trees.
+        """
+        logger.info("Migrating database to schema version 6")
+
+        conn.execute("DROP INDEX IF EXISTS idx_messages_session_id")
+        conn.execute("DROP INDEX IF EXISTS idx_templates_name")
+
+        # Update schema version
+        conn.execute(
+            """
+            INSERT INTO schema_version (version, applied_at)
+            VALUES (6, ?)
+            """,
+            (format_datetime(datetime.now(timezone.utc)),),
+        )
+
+    def _migrate_to_v7(self, conn) -> None:
+        """Migration for version 7: Materialized session message count
+
+        Like first_message/last_message, message_count is maintained by
+        triggers on messages so session listings don't aggregate messages.
+        """
+        logger.info("Migrating database to schema version 7")
+
+        cursor = conn.execute(
+            """
+            SELECT name FROM pragma_table_info('sessions')
+            WHERE name='message_count'
+            """
+        )
+        if not cursor.fetchone():
+            logger.info("Adding message_count column to sessions table")
+            conn.execute(
+                """
+                ALTER TABLE sessions
+                ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0
+                """
+            )
+
+        _execute_script(
+            conn,
+            """
+            CREATE TRIGGER IF NOT EXISTS sessions_message_count_insert
+            AFTER INSERT ON messages BEGIN
+                UPDATE sessions SET message_count = message_count + 1
+                WHERE session_id = NEW.session_id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS sessions_message_count_delete
+            AFTER DELETE ON messages BEGIN
+                UPDATE sessions SET message_count = message_count - 1
+                WHERE session_id = OLD.session_id;
+            END;
+
+            UPDATE sessions SET message_count = (
+                SELECT COUNT(*) FROM messages
+                WHERE messages.session_id = sessions.session_id
+            );
+            """,
+        )
+
+        # Update schema version
+        conn.execute(
+            """
+            INSERT INTO schema_version (version, applied_at)
+            VALUES (7, ?)
+            """,
+            (format_datetime(datetime.now(timezone.utc)),),
+        )
+
+    def _migrate_to_v8(self, conn) -> None:
+        """Migration for version 8: Integer timestamps
+
+        Session and message timestamps are stored as integer microseconds since
+        the epoch instead of ISO 8601 text, so range filters, ordering and
+        MIN/MAX compare integers and rows are read without string parsing.
+        """
+        logger.info("Migrating database to schema version 8")
+
+        def to_micros(value):
+            return (
+                to_epoch_micros(parse_datetime(value))
+                if isinstance(value, str)
+                else value
+            )
+
+        for table, key, columns in (
+            ("sessions", "session_id", ("created_at", "last_active")),
+            ("messages", "message_id", ("timestamp",)),
+        ):
+            rows = conn.execute(
+                f"SELECT {key}, {', '.join(columns)} FROM {table}"
+            ).fetchall()
+            conn.executemany(
+                f"""
+                UPDATE {table}
+                SET {', '.join(f'{column} = ?' for column in columns)}
+                WHERE {key} = ?
+                """,
+                [
+                    (*(to_micros(row[column]) for column in columns), row[key])
+                    for row in rows
+                ],
+            )
+
+        _execute_script(
+            conn,
+            f"""
+            DROP TRIGGER IF EXISTS sessions_span_insert;
+            DROP TRIGGER IF EXISTS sessions_span_delete;
+
+            {SPAN_TRIGGERS_SQL.format(long_session=LONG_SESSION_SQL)}
+
+            {SPAN_BACKFILL_SQL.format(long_session=LONG_SESSION_SQL)}
+            """,
+        )
+
+        # Update schema version
+        conn.execute(
+            """
+            INSERT INTO schema_version (version, applied_at)
+            VALUES (8, ?)
+            """,
+            (format_datetime(datetime.now(timezone.utc)),),
+        )
+
+    def _migrate_to_v9(self, conn) -> None:
+        """Migration for version 9: Single message insert trigger
+
+        One AFTER INSERT trigger maintains the session activity span,
+        message_count and last_active, replacing the separate span and count
+        triggers and the UPDATE that save_messages used to issue.
+        """
+        logger.info("Migrating database to schema version 9")
+
+        _execute_script(
+            conn,
+            f"""
+            DROP TRIGGER IF EXISTS sessions_span_insert;
+            DROP TRIGGER IF EXISTS sessions_message_count_insert;
+
+            CREATE TRIGGER IF NOT EXISTS sessions_message_insert
+            AFTER INSERT ON messages BEGIN
+                UPDATE sessions SET
+                    first_message = MIN(
+                        COALESCE(first_message, NEW.timestamp), NEW.timestamp
+                    ),
+                    last_message = MAX(
+                        COALESCE(last_message, NEW.timestamp), NEW.timestamp
+                    ),
+                    message_count = message_count + 1,
+                    last_active = MAX(last_active, NEW.timestamp)
+                WHERE session_id = NEW.session_id;
+                UPDATE sessions SET long_session = {LONG_SESSION_SQL}
+                WHERE session_id = NEW.session_id;
+            END;
+            """,
+        )
+
+        # Update schema version
+        conn.execute(
+            """
+            INSERT INTO schema_version (version, applied_at)
+            VALUES (9, ?)
+            """,
+            (format_datetime(datetime.now(timezone.utc)),),
+        )
+
+    def _migrate_to_v10(self, conn) -> None:
+        """Migration for version 10: Cascade session deletes to messages
+
+        A trigger stands in for ON DELETE CASCADE, which would need the
+        messages table rebuilt and foreign key enforcement enabled. It runs
+        after the session row is gone, so the per-message span and count
+        triggers have no session row left to update.
+        """
+        logger.info("Migrating database to schema version 10")
+
+        _execute_script(
+            conn,
+            """
+            CREATE TRIGGER IF NOT EXISTS sessions_delete_messages
+            AFTER DELETE ON sessions BEGIN
+                DELETE FROM messages WHERE session_id = OLD.session_id;
+            END;
+            """,
+        )
+
+        # Update schema version
+        conn.execute(
+            """
+            INSERT INTO schema_version (version, applied_at)
+            VALUES (10, ?)
+            """,
+            (format_datetime(datetime.now(timezone.utc)),),
+        )
+
+    def _migrate_to_v11(self, conn) -> None:
+        """Migration for version 11: Drop the standalone message timestamp index
+
+        Every query that filters messages by timestamp also pins session_id, so
+        idx_messages_session_timestamp serves them and idx_messages_timestamp
+        only added a b-tree update to each message insert.
+        """
+        logger.info("Migrating database to schema version 11")
+
+        conn.execute("DROP INDEX IF EXISTS idx_messages_timestamp")
+
+        # Update schema version
+        conn.execute(
+            """
+            INSERT INTO schema_version (version, applied_at)
+            VALUES (11, ?)
+            """,
+            (format_datetime(datetime.now(timezone.utc)),),
+        )
+
+    def _migrate_to_v12(self, conn) -> None:
+        """Migration for version 12: Partial index on the default template
+
+        Only one template row has is_default = 1, so the index holds a single
+        entry and lets get_default_template seek instead of scanning templates.
+        """
+        logger.info("Migrating database to schema version 12")
+
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_templates_default
+            ON templates(is_default) WHERE is_default = 1
+            """
+        )
+
+        # Update schema version
+        conn.execute(
+            """
+            INSERT INTO schema_version (version, applied_at)
+            VALUES (12, ?)
+            """,
+            (format_datetime(datetime.now(timezone.utc)),),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection for the pool
+
+        isolation_level=None disables the sqlite3 module's implicit BEGIN
+        before DML, so get_connection controls transactions explicitly.
+        """
+        conn = sqlite3.connect(
+            self._database, check_same_thread=False, uri=True, isolation_level=None
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
     @contextmanager
-    def get_connection(self):
-        """Create a new connection with row factory for dict results"""
-        conn = None
+    def get_connection(self, write: bool = False):
+        """Borrow a pooled connection and yield a cursor with dict-like rows
+
+        With write=True the block runs in a BEGIN IMMEDIATE transaction, taking
+        the write lock up front instead of upgrading mid-transaction; it is
+        committed when the block exits normally and rolled back on exception.
+        Use _execute_script rather than executescript inside it, since
+        executescript commits the open transaction first. Reads run each
+        statement in its own implicit transaction. The connection then goes
+        back to the pool.
+
+        Args:
+            write: Whether the block writes to the database
+        """
         try:
-            # Attempt to create a connection
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            conn = self._pool.get_nowait()
+        except queue.Empty:
             try:
-                yield cursor  # Provide the cursor to the calling context
-                conn.commit()  # Commit the transaction if no exceptions occur
+                conn = self._connect()
             except Exception as e:
-                conn.rollback()  # Roll back the transaction on exception
+                # Handle exceptions during connection setup
                 raise RuntimeError(
-                    f"Failed to execute query on database at {self.db_path}: {str(e)}"
+                    f"Failed to connect to database at {self.db_path}: {str(e)}"
                 ) from e
+
+        cursor = conn.cursor()
+        try:
+            if write:
+                cursor.execute("BEGIN IMMEDIATE")
+            yield cursor  # Provide the cursor to the calling context
+            if conn.in_transaction:
+                conn.commit()  # Commit the transaction if no exceptions occur
         except Exception as e:
-            # Handle exceptions during connection setup
+            if conn.in_transaction:
+                conn.rollback()  # Roll back the transaction on exception
             raise RuntimeError(
-                f"Failed to connect to database at {self.db_path}: {str(e)}"
+                f"Failed to execute query on database at {self.db_path}: {str(e)}"
             ) from e
         finally:
-            # Ensure the connection is closed if it was successfully opened
-            if conn:
-                conn.close()
+            if conn.in_transaction:
+                # Left open by a generator that was closed early
+                conn.rollback()
+            cursor.close()
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
 
     def init_db(self) -> None:
         """Initialize database schema"""
         # Set restrictive permissions on the database file if it doesn't exist
         db_file = Path(self.db_path)
-        if not db_file.exists():
+        if self._in_memory:
+            logger.debug("Using in-memory SQLite database")
+        elif not db_file.exists():
             # Create empty file with restrictive permissions
             db_file.touch(
                 mode=0o600
@@ -334,18 +958,23 @@ class SQLiteChatStorage(StorageInterface):
             # Update permissions on existing file
             db_file.chmod(0o600)
 
-        with self.get_connection() as conn:
-            conn.executescript(
+        with self.get_connection(write=True) as conn:
+            _execute_script(
+                conn,
                 """
                 CREATE TABLE IF NOT EXISTS sessions (
                     session_id TEXT PRIMARY KEY,
                     title TEXT NOT NULL,
-                    created_at TIMESTAMP NOT NULL,
-                    last_active TIMESTAMP NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    last_active INTEGER NOT NULL,
                     config TEXT NOT NULL,
                     is_private BOOLEAN NOT NULL DEFAULT 0,
                     input_tokens_used INTEGER NOT NULL DEFAULT 0,
-                    output_tokens_used INTEGER NOT NULL DEFAULT 0
+                    output_tokens_used INTEGER NOT NULL DEFAULT 0,
+                    first_message INTEGER,
+                    last_message INTEGER,
+                    long_session BOOLEAN NOT NULL DEFAULT 0,
+                    message_count INTEGER NOT NULL DEFAULT 0
                 );
 
                 CREATE TABLE IF NOT EXISTS messages (
@@ -354,7 +983,7 @@ class SQLiteChatStorage(StorageInterface):
                     role TEXT NOT NULL,
                     content TEXT NOT NULL,
                     message_index INTEGER NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
+                    timestamp INTEGER NOT NULL,
                     FOREIGN KEY (session_id) REFERENCES sessions(session_id),
                     UNIQUE(session_id, message_index)  -- Ensure unique indexes per session
                 );
@@ -371,22 +1000,15 @@ class SQLiteChatStorage(StorageInterface):
 
                 CREATE INDEX IF NOT EXISTS idx_sessions_last_active
                 ON sessions(last_active);
-
-                CREATE INDEX IF NOT EXISTS idx_messages_session_id
-                ON messages(session_id, message_index);
-
-                CREATE INDEX IF NOT EXISTS idx_messages_timestamp
-                ON messages(timestamp);
-
-                CREATE INDEX IF NOT EXISTS idx_templates_name
-                ON templates(name);
-            """
+            """,
             )
-            self.initialize_preset_templates()
-            self._migrate_db()
+
+        # Each runs in its own write transaction, after the base schema commits
+        self.initialize_preset_templates()
+        self._migrate_db()
 
     def store_session(self, session: ChatSession) -> None:
-        with self.get_connection() as conn:
+        with self.get_connection(write=True) as conn:
             conn.execute(
                 """
                 INSERT INTO sessions
@@ -396,8 +1018,8 @@ class SQLiteChatStorage(StorageInterface):
                 (
                     session.session_id,
                     session.title,
-                    format_datetime(session.created_at),
-                    format_datetime(session.last_active),
+                    to_epoch_micros(session.created_at),
+                    to_epoch_micros(session.last_active),
                     session.config.model_dump_json(),
                     session.is_private,
                     session.input_tokens_used,
@@ -406,7 +1028,7 @@ class SQLiteChatStorage(StorageInterface):
             )
 
     def update_session(self, session: ChatSession) -> None:
-        with self.get_connection() as conn:
+        with self.get_connection(write=True) as conn:
             conn.execute(
                 """
                 UPDATE sessions
@@ -415,8 +1037,8 @@ class SQLiteChatStorage(StorageInterface):
             """,
                 (
                     session.title,
-                    format_datetime(session.last_active),
-                    json.dumps(session.config.model_dump()),
+                    to_epoch_micros(session.last_active),
+                    session.config.model_dump_json(),
                     session.is_private,
                     session.input_tokens_used,
                     session.output_tokens_used,
@@ -426,35 +1048,40 @@ class SQLiteChatStorage(StorageInterface):
 
     def save_message(self, message: ChatMessage) -> None:
         """Save a message to a chat session and update last_active"""
-        with self.get_connection() as conn:
-            # allow db to autoincrement message_id
-            conn.execute(
+        self.save_messages([message])
+
+    def save_messages(self, messages: Iterable[ChatMessage]) -> None:
+        """Save messages in a single transaction
+
+        The sessions_message_insert trigger updates each session's
+        last_active, activity span and message count.
+        """
+        rows = [
+            (
+                message.session_id,
+                message.role,
+                message.serialize_message_content(),
+                message.index,
+                to_epoch_micros(message.created_at),
+            )
+            for message in messages
+        ]
+        if not rows:
+            return
+
+        with self.get_connection(write=True) as conn:
+            conn.executemany(
                 """
                 INSERT INTO messages
                 (session_id, role, content, message_index, timestamp)
                 VALUES (?, ?, ?, ?, ?)
                 """,
-                (
-                    message.session_id,
-                    message.role,
-                    message.serialize_message_content(),
-                    message.index,
-                    format_datetime(message.created_at),
-                ),
-            )
-            # Update session's last_active timestamp
-            conn.execute(
-                """
-                UPDATE sessions
-                SET last_active = ?
-                WHERE session_id = ?
-            """,
-                (format_datetime(message.created_at), message.session_id),
+                rows,
             )
 
     def delete_messages_from_index(self, session_id: str, from_index: int) -> None:
         """Delete all messages with index >= from_index for the given session."""
-        with self.get_connection() as conn:
+        with self.get_connection(write=True) as conn:
             conn.execute(
                 """
                 DELETE FROM messages
@@ -465,90 +1092,100 @@ class SQLiteChatStorage(StorageInterface):
 
     def delete_message(self, session_id: str, index: int) -> None:
         """Delete a specific message by its index from a chat session."""
-        with self.get_connection() as conn:
-            try:
-                # Start a transaction
-                conn.execute("BEGIN TRANSACTION")
-
-                # Delete the specific message
-                result = conn.execute(
-                    """
-                    DELETE FROM messages
-                    WHERE session_id = ? AND message_index = ?
-                    """,
-                    (session_id, index),
-                )
-
-                # Check if a message was actually deleted
-                if result.rowcount == 0:
-                    raise ValueError(
-                        f"No message found with index {index} in session {session_id}"
-                    )
+        with self.get_connection(write=True) as conn:
+            # Delete the specific message
+            result = conn.execute(
+                """
+                DELETE FROM messages
+                WHERE session_id = ? AND message_index = ?
+                """,
+                (session_id, index),
+            )
 
-                # Update indexes of subsequent messages
-                conn.execute(
-                    """
-                    UPDATE messages
-                    SET message_index = message_index - 1
-                    WHERE session_id = ? AND message_index > ?
-                    """,
-                    (session_id, index),
+            # Check if a message was actually deleted
+            if result.rowcount == 0:
+                raise ValueError(
+                    f"No message found with index {index} in session {session_id}"
                 )
 
-                # Update session's last_active timestamp
-                conn.execute(
-                    """
-                    UPDATE sessions
-                    SET last_active = ?
-                    WHERE session_id = ?
-                    """,
-                    (format_datetime(datetime.now(timezone.utc)), session_id),
-                )
+            # Update indexes of subsequent messages
+            conn.execute(
+                """
+                UPDATE messages
+                SET message_index = message_index - 1
+                WHERE session_id = ? AND message_index > ?
+                """,
+                (session_id, index),
+            )
 
-                # Commit the transaction
-                conn.execute("COMMIT")
-            except Exception as e:
-                # If any error occurs, rollback the transaction
-                conn.execute("ROLLBACK")
-                raise e
+            # Update session's last_active timestamp
+            conn.execute(
+                """
+                UPDATE sessions
+                SET last_active = ?
+                WHERE session_id = ?
+                """,
+                (to_epoch_micros(), session_id),
+            )
 
-    def _deserialize_message(self, row: sqlite3.Row) -> ChatMessage:
-        """Deserialize a message from the database row"""
+    def _deserialize_message(self, row: tuple) -> ChatMessage:
+        """Deserialize a message from a plain tuple row in MESSAGE_COLUMNS order"""
+        message_id, session_id, role, content, message_index, timestamp = row
         return ChatMessage.create(
-            message_id=row["message_id"],
-            session_id=row["session_id"],
-            role=row["role"],
-            content=ChatMessage.deserialize_message_content(row["content"]),
-            index=row["message_index"],
-            created_at=parse_datetime(row["timestamp"]),
+            message_id=message_id,
+            session_id=session_id,
+            role=role,
+            content=ChatMessage.deserialize_message_content(content),
+            index=message_index,
+            created_at=from_epoch_micros(timestamp),
         )
 
-    def _deserialize_session(self, row: sqlite3.Row) -> ChatSession:
-        """Deserialize a session from the database row"""
-        session_data = dict(row)
+    def _deserialize_session(self, row: tuple) -> ChatSession:
+        """Deserialize a session from a plain tuple row in SESSION_COLUMNS order"""
+        (
+            session_id,
+            title,
+            created_at,
+            last_active,
+            config,
+            is_private,
+            input_tokens_used,
+            output_tokens_used,
+        ) = row
         return ChatSession(
-            session_id=session_data["session_id"],
-            title=session_data["title"],
-            created_at=parse_datetime(session_data["created_at"]),
-            last_active=parse_datetime(session_data["last_active"]),
-            config=LLMConfig.model_validate_json(session_data["config"], strict=True),
-            is_private=bool(session_data.get("is_private", False)),
-            input_tokens_used=session_data.get("input_tokens_used", 0),
-            output_tokens_used=session_data.get("output_tokens_used", 0),
+            session_id=session_id,
+            title=title,
+            created_at=from_epoch_micros(created_at),
+            last_active=from_epoch_micros(last_active),
+            config=LLMConfig.model_validate_json(config, strict=True),
+            is_private=bool(is_private),
+            input_tokens_used=input_tokens_used,
+            output_tokens_used=output_tokens_used,
         )
 
     def get_messages(self, session_id: str) -> List[ChatMessage]:
         """Get all messages for a session"""
+        return list(self.iter_messages(session_id))
+
+    def iter_messages(self, session_id: str) -> Iterator[ChatMessage]:
+        """Iterate over a session's messages in index order
+
+        Rows are fetched in batches of MESSAGE_FETCH_SIZE. The pooled
+        connection is held until the iterator is exhausted or closed.
+        """
         with self.get_connection() as conn:
-            cursor = conn.execute(
-                """
-                SELECT * FROM messages
+            # Plain tuples skip building a sqlite3.Row per message
+            conn.row_factory = None
+            conn.execute(
+                f"""
+                SELECT {MESSAGE_COLUMNS} FROM messages
                 WHERE session_id = ?
-                ORDER BY timestamp
+                ORDER BY message_index
             """,
                 (session_id,),
             )
-            return [self._deserialize_message(row) for row in cursor.fetchall()]
+            while batch := conn.fetchmany(MESSAGE_FETCH_SIZE):
+                yield from map(self._deserialize_message, batch)
 
     def search_sessions(
         self,
@@ -557,8 +1194,17 @@ class SQLiteChatStorage(StorageInterface):
         search_titles: bool = True,
         search_content: bool = True,
         date_range: Optional[Tuple[datetime, datetime]] = None,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> List[ChatSession]:
-        """Search sessions with multi-term support"""
+        """Search sessions with multi-term support
+
+        A session matches a term if the term appears in its title or in any of
+        its messages. Matching runs against the trigram FTS tables, so LIKE
+        patterns of three or more characters are answered from the index;
+        shorter terms scan the FTS tables.
+        """
         with self.get_connection() as conn:
             query_conditions = []
             params = []
@@ -567,40 +1213,30 @@ class SQLiteChatStorage(StorageInterface):
             for term in query:
                 term_conditions = []
                 search_pattern = f"%{term}%"
+                # A unary + hides the column from FTS5, so the LIKE is checked
+                # by scanning the table instead of through the trigram index
+                scan = "" if _trigram_indexable(term) else "+"
 
                 if search_titles:
-                    term_conditions.append("s.title LIKE ?")
-                    params.append(search_pattern)
-
-                if search_content:
-                    # For single string content
                     term_conditions.append(
-                        "(json_type(m.content) = 'text' AND m.content LIKE ?)"
+                        "s.session_id IN (SELECT session_id FROM sessions_fts "
+                        f"WHERE {scan}title LIKE ?)"
                     )
                     params.append(search_pattern)
 
-                    # For array content items
+                if search_content:
                     term_conditions.append(
-                        """
-                        (json_type(m.content) = 'array' AND
-                        EXISTS (
-                            SELECT 1
-                            FROM json_each(m.content) as items
-                            WHERE
-                                (json_extract(items.value, '$.text') LIKE ? AND json_extract(items.value, '$.text') IS NOT NULL) OR
-                                (json_extract(items.value, '$.thinking') LIKE ? AND json_extract(items.value, '$.thinking') IS NOT NULL)
-                        ))
-                        """
+                        "s.session_id IN (SELECT session_id FROM messages_fts "
+                        f"WHERE {scan}body LIKE ?)"
                     )
                     params.append(search_pattern)
-                    params.append(search_pattern)
 
                 # Combine conditions for this term
-                term_query = f"({' OR '.join(term_conditions)})"
+                term_query = f"({' OR '.join(term_conditions) or '0'})"
                 query_conditions.append(term_query)
 
             # Combine all term conditions with AND/OR
-            where_clause = f" {operator} ".join(query_conditions)
+            where_clause = f" {operator} ".join(query_conditions) or "1"
 
             # Add date range if specified
             date_conditions = []
@@ -610,85 +1246,140 @@ class SQLiteChatStorage(StorageInterface):
                     date_conditions.append("m.timestamp BETWEEN ? AND ?")
                     params.extend(
                         [
-                            format_datetime(start_date),
-                            format_datetime(end_date),
+                            to_epoch_micros(start_date),
+                            to_epoch_micros(end_date),
                         ]
                     )
                 elif start_date:
                     date_conditions.append("m.timestamp >= ?")
-                    params.append(format_datetime(start_date))
+                    params.append(to_epoch_micros(start_date))
                 elif end_date:
                     date_conditions.append("m.timestamp <= ?")
-                    params.append(format_datetime(end_date))
+                    params.append(to_epoch_micros(end_date))
 
             if date_conditions:
-                where_clause = f"({where_clause}) AND ({' AND '.join(date_conditions)})"
+                where_clause = f"""({where_clause}) AND EXISTS (
+                    SELECT 1 FROM messages m
+                    WHERE m.session_id = s.session_id
+                    AND {' AND '.join(date_conditions)}
+                )"""
 
             command_str = f"""
-                SELECT DISTINCT
-                    s.*,
-                    MAX(m.timestamp) as last_message,
-                    COUNT(m.message_id) as message_count
+                SELECT {SESSION_COLUMNS}
                 FROM sessions s
-                LEFT JOIN messages m ON s.session_id = m.session_id
                 WHERE {where_clause}
-                GROUP BY s.session_id
-                ORDER BY MAX(m.timestamp) DESC NULLS LAST
+                ORDER BY s.last_message DESC NULLS LAST
+                LIMIT ? OFFSET ?
                 """
+            params.extend([limit if limit is not None else -1, offset])
 
+            conn.row_factory = None
             cursor = conn.execute(command_str, params)
-            return [self._deserialize_session(row) for row in cursor.fetchall()]
+            return list(map(self._deserialize_session, cursor))
 
     def get_active_sessions_by_date_range(
         self, start_date: datetime, end_date: datetime
     ) -> List[ChatSession]:
-        """Get sessions that have messages within the date range"""
+        """Get sessions that have messages within the date range
+
+        Candidate sessions are those whose [first_message, last_message] span
+        overlaps the range. Short sessions must have started within
+        SHORT_SESSION_SPAN before the range, which bounds the index range on
+        first_message from both sides; long sessions come from their own
+        partial index. The per-session message check is pinned to
+        idx_messages_session_timestamp so it stays a covering range probe.
+        """
+        start = to_epoch_micros(start_date)
+        end = to_epoch_micros(end_date)
         with self.get_connection() as conn:
+            conn.row_factory = None
             cursor = conn.execute(
-                """
-                SELECT DISTINCT
-                    s.*,
-                    MIN(m.timestamp) as first_message,
-                    MAX(m.timestamp) as last_message,
-                    COUNT(m.message_id) as message_count
+                f"""
+                SELECT {SESSION_COLUMNS}
                 FROM sessions s
-                INNER JOIN messages m ON s.session_id = m.session_id
-                WHERE m.timestamp BETWEEN ? AND ?
-                GROUP BY s.session_id
-                ORDER BY MAX(m.timestamp) DESC
+                WHERE (
+                    (
+                        s.first_message BETWEEN ? AND ?
+                        AND s.last_message >= ?
+                    )
+                    OR (
+                        s.long_session = 1
+                        AND s.last_message >= ?
+                        AND s.first_message <= ?
+                    )
+                )
+                AND EXISTS (
+                    SELECT 1 FROM messages m
+                    INDEXED BY idx_messages_session_timestamp
+                    WHERE m.session_id = s.session_id
+                    AND m.timestamp BETWEEN ? AND ?
+                )
+                ORDER BY s.last_message DESC
             """,
-                (format_datetime(start_date), format_datetime(end_date)),
+                (
+                    to_epoch_micros(start_date - SHORT_SESSION_SPAN),
+                    end,
+                    start,
+                    start,
+                    end,
+                    start,
+                    end,
+                ),
             )
-            return [self._deserialize_session(row) for row in cursor.fetchall()]
+            return list(map(self._deserialize_session, cursor))
 
     def get_session(self, session_id: str) -> ChatSession:
         """Get a specific chat session"""
         with self.get_connection() as conn:
+            conn.row_factory = None
             cursor = conn.execute(
-                """
-                SELECT * FROM sessions
+                f"""
+                SELECT {SESSION_COLUMNS} FROM sessions
                 WHERE session_id = ?
                 """,
                 (session_id,),
             )
             row = cursor.fetchone()
-            if row:
-                return self._deserialize_session(row)
-            else:
-                raise ValueError(f"No session found with id {session_id}")
+        # Raised outside the block so callers get the ValueError itself rather
+        # than the RuntimeError get_connection wraps query failures in
+        if not row:
+            raise ValueError(f"No session found with id {session_id}")
+        return self._deserialize_session(row)
+
+    def get_sessions(self, session_ids: Iterable[str]) -> Dict[str, ChatSession]:
+        """Get several chat sessions in one query, keyed by session id
+
+        The ids are bound as a single JSON array, so the statement text is the
+        same for any batch size and stays in the statement cache. Sessions are
+        returned in the order requested.
+        """
+        session_ids = list(session_ids)
+        with self.get_connection() as conn:
+            conn.row_factory = None
+            cursor = conn.execute(
+                f"""
+                SELECT {SESSION_COLUMNS} FROM sessions
+                WHERE session_id IN (SELECT value FROM json_each(?))
+                """,
+                (json.dumps(session_ids),),
+            )
+            sessions = map(self._deserialize_session, cursor)
+            found = {session.session_id: session for session in sessions}
+        return {
+            session_id: found[session_id]
+            for session_id in session_ids
+            if session_id in found
+        }
 
     def get_recent_sessions(
         self, limit: int = 10, include_private=False
     ) -> List[ChatSession]:
         """Get most recently active sessions"""
         with self.get_connection() as conn:
-            query = """
-                SELECT s.*,
-                    (SELECT COUNT(*) FROM messages WHERE messages.session_id = s.session_id) as message_count,
-                    (SELECT MIN(timestamp) FROM messages WHERE messages.session_id = s.session_id) as first_message,
-                    (SELECT MAX(timestamp) FROM messages WHERE messages.session_id = s.session_id) as last_message
+            query = f"""
+                SELECT {SESSION_COLUMNS}
                 FROM sessions s
-                {where_clause}
+                {{where_clause}}
                 ORDER BY last_active DESC
                 LIMIT ?
                 """
@@ -701,12 +1392,13 @@ class SQLiteChatStorage(StorageInterface):
                 # Include all sessions
                 query = query.format(where_clause="")
 
+            conn.row_factory = None
             cursor = conn.execute(query, (limit,))
-            return [self._deserialize_session(row) for row in cursor.fetchall()]
+            return list(map(self._deserialize_session, cursor))
 
     def rename_session(self, session_id: str, new_title: str) -> None:
         """Rename a chat session"""
-        with self.get_connection() as conn:
+        with self.get_connection(write=True) as conn:
             conn.execute(
                 """
                 UPDATE sessions
@@ -715,56 +1407,32 @@ class SQLiteChatStorage(StorageInterface):
             """,
                 (
                     new_title,
-                    format_datetime(datetime.now(timezone.utc)),
+                    to_epoch_micros(),
                     session_id,
                 ),
             )
 
     def delete_session(self, session_id: str) -> None:
-        """Delete a session and its messages"""
-        with self.get_connection() as conn:
-            try:
-                # Start a transaction
-                conn.execute("BEGIN TRANSACTION")
-
-                # Delete all messages associated with the session
-                conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+        """Delete a session and its messages
 
-                # Delete the session itself
-                result = conn.execute(
-                    "DELETE FROM sessions WHERE session_id = ?", (session_id,)
-                )
+        The sessions_delete_messages trigger removes the messages.
+        """
+        with self.get_connection(write=True) as conn:
+            result = conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
 
-                # Check if a session was actually deleted
-                if result.rowcount == 0:
-                    raise ValueError(f"No session found with id {session_id}")
-
-                # Commit the transaction
-                conn.execute("COMMIT")
-            except Exception as e:
-                # If any error occurs, rollback the transaction
-                conn.execute("ROLLBACK")
-                raise e  # Re-raise the exception after rollback
+        # Check if a session was actually deleted
+        if result.rowcount == 0:
+            raise ValueError(f"No session found with id {session_id}")
 
     def delete_all_sessions(self) -> None:
-        """Delete all chat sessions and their messages"""
-        with self.get_connection() as conn:
-            try:
-                # Start a transaction
-                conn.execute("BEGIN TRANSACTION")
-
-                # Delete all messages first (due to foreign key constraint)
-                conn.execute("DELETE FROM messages")
-
-                # Delete all sessions
-                conn.execute("DELETE FROM sessions")
+        """Delete all chat sessions and their messages
 
-                # Commit the transaction
-                conn.execute("COMMIT")
-            except Exception as e:
-                # If any error occurs, rollback the transaction
-                conn.execute("ROLLBACK")
-                raise RuntimeError(f"Failed to delete all sessions: {str(e)}")
+        The sessions_delete_messages trigger removes the messages.
+        """
+        with self.get_connection(write=True) as conn:
+            conn.execute("DELETE FROM sessions")
 
     def _deserialize_template(self, row: sqlite3.Row) -> ChatTemplate:
         """Deserialize a template from the database row"""
@@ -776,7 +1444,7 @@ class SQLiteChatStorage(StorageInterface):
         )
 
     def store_chat_template(self, template: ChatTemplate) -> None:
-        with self.get_connection() as conn:
+        with self.get_connection(write=True) as conn:
             conn.execute(
                 """
                 INSERT INTO templates
@@ -793,32 +1461,47 @@ class SQLiteChatStorage(StorageInterface):
 
     def initialize_preset_templates(self) -> None:
         """Initialize default preset templates if they don't exist"""
-        with self.get_connection() as conn:
-            # Check if any templates exist
-            cursor = conn.execute("SELECT COUNT(*) as count FROM templates")
-            templates_count = cursor.fetchone()["count"]
-
-            # Check if a default template exists
+        with self.get_connection(write=True) as conn:
+            # Check how many templates and defaults exist in one pass
             cursor = conn.execute(
-                "SELECT COUNT(*) as count FROM templates WHERE is_default = 1"
+                """
+                SELECT COUNT(*) as count, COALESCE(SUM(is_default), 0) as default_count
+                FROM templates
+                """
             )
-            default_count = cursor.fetchone()["count"]
+            counts = cursor.fetchone()
 
-            if templates_count == 0:
-                # No templates exist, initialize presets
+            if counts["count"] == 0:
+                # No templates exist, initialize presets with the first one as
+                # default, all in this transaction
                 presets = super().get_preset_templates()
-                for template in presets:
-                    self.store_chat_template(template)
-                # Set first preset as default
-                self.set_default_template(presets[0].template_id)
-            elif default_count == 0:
+                conn.executemany(
+                    """
+                    INSERT INTO templates
+                    (template_id, name, description, config, is_default)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            template.template_id,
+                            template.name,
+                            template.description,
+                            template.config.model_dump_json(),
+                            position == 0,
+                        )
+                        for position, template in enumerate(presets)
+                    ],
+                )
+            elif counts["default_count"] == 0:
                 # Templates exist but no default set, set first template as default
-                cursor = conn.execute(
-                    "SELECT template_id FROM templates ORDER BY name LIMIT 1"
+                conn.execute(
+                    """
+                    UPDATE templates SET is_default = 1
+                    WHERE template_id = (
+                        SELECT template_id FROM templates ORDER BY name LIMIT 1
+                    )
+                    """
                 )
-                first_template = cursor.fetchone()
-                if first_template:
-                    self.set_default_template(first_template["template_id"])
 
     def get_chat_template_by_id(self, template_id: str) -> ChatTemplate:
         """Get a specific chat template by id"""
@@ -859,11 +1542,11 @@ class SQLiteChatStorage(StorageInterface):
                 ORDER BY name
                 """
             )
-            return [self._deserialize_template(row) for row in cursor.fetchall()]
+            return list(map(self._deserialize_template, cursor))
 
     def update_chat_template(self, template: ChatTemplate) -> None:
         """Update an existing chat template"""
-        with self.get_connection() as conn:
+        with self.get_connection(write=True) as conn:
             result = conn.execute(
                 """
                 UPDATE templates
@@ -882,7 +1565,7 @@ class SQLiteChatStorage(StorageInterface):
 
     def delete_chat_template(self, template_id: str) -> None:
         """Delete a chat template"""
-        with self.get_connection() as conn:
+        with self.get_connection(write=True) as conn:
             result = conn.execute(
                 """
                 DELETE FROM templates
@@ -902,38 +1585,29 @@ class SQLiteChatStorage(StorageInterface):
         Raises:
             ValueError: If template_id doesn't exist
         """
-        with self.get_connection() as conn:
-            try:
-                conn.execute("BEGIN TRANSACTION")
-
-                # Verify template exists
-                cursor = conn.execute(
-                    "SELECT 1 FROM templates WHERE template_id = ?",
-                    (template_id,),
-                )
-                if not cursor.fetchone():
-                    raise ValueError(f"No template found with id {template_id}")
-
-                # Clear existing default
-                conn.execute("UPDATE templates SET is_default = 0")
-
-                # Set new default
-                result = conn.execute(
-                    "UPDATE templates SET is_default = 1 WHERE template_id = ?",
-                    (template_id,),
-                )
+        with self.get_connection(write=True) as conn:
+            # Verify template exists
+            cursor = conn.execute(
+                "SELECT 1 FROM templates WHERE template_id = ?",
+                (template_id,),
+            )
+            if not cursor.fetchone():
+                raise ValueError(f"No template found with id {template_id}")
 
-                conn.execute("COMMIT")
+            # Clear existing default
+            conn.execute("UPDATE templates SET is_default = 0")
 
-            except Exception as e:
-                conn.execute("ROLLBACK")
-                raise e
+            # Set new default
+            conn.execute(
+                "UPDATE templates SET is_default = 1 WHERE template_id = ?",
+                (template_id,),
+            )
 
     def get_default_template(self) -> ChatTemplate:
         """Get the current default template
 
         Returns:
-            The default template if one is set, raise otherwise
+            The default template if one is set, raises ValueError otherwise
         """
         with self.get_connection() as conn:
             cursor = conn.execute(
@@ -942,8 +1616,9 @@ class SQLiteChatStorage(StorageInterface):
                 WHERE is_default = 1
                 """
             )
-            try:
-                row = cursor.fetchone()
-                return self._deserialize_template(row)
-            except Exception as e:
-                raise e
+            row = cursor.fetchone()
+        # Raised outside the block so callers get the ValueError itself rather
+        # than the RuntimeError get_connection wraps query failures in
+        if not row:
+            raise ValueError("No default template is set")
+        return self._deserialize_template(row)
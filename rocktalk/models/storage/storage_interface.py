@@ -2,7 +2,7 @@ import os
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import StrEnum
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..interfaces import (
     ChatMessage,
@@ -25,18 +25,39 @@ class SearchOperator(StrEnum):
 class StorageInterface(ABC):
     """Protocol defining the interface for chat storage implementations"""
 
-    CURRENT_SCHEMA_VERSION = 3
+    CURRENT_SCHEMA_VERSION = 12
 
     @abstractmethod
     def save_message(self, message: ChatMessage) -> None:
         """Save a message to a chat session"""
         ...
 
+    def save_messages(self, messages: Iterable[ChatMessage]) -> None:
+        """Save several messages at once
+
+        Implementations should override this to write the batch in a single
+        transaction.
+        """
+        for message in messages:
+            self.save_message(message)
+
     @abstractmethod
     def get_messages(self, session_id: str) -> List[ChatMessage]:
-        """Get all messages for a session"""
+        """Get all messages for a session
+
+        Implementations should read these through an index on
+        (session_id, message index) rather than scanning all messages.
+        """
         ...
 
+    def iter_messages(self, session_id: str) -> Iterator[ChatMessage]:
+        """Iterate over a session's messages in index order
+
+        Implementations should override this to stream rows instead of
+        materializing the whole session.
+        """
+        yield from self.get_messages(session_id)
+
     @abstractmethod
     def search_sessions(
         self,
@@ -45,15 +66,24 @@ class StorageInterface(ABC):
         search_titles: bool = True,
         search_content: bool = True,
         date_range: Optional[Tuple[datetime, datetime]] = None,
+        *,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> List[ChatSession]:
         """Search sessions with advanced filtering
 
+        Implementations should back title and content matching with a text
+        index, so search cost follows the number of hits rather than the size
+        of the chat history.
+
         Args:
             query: List of search terms
             operator: SearchOperator.AND or SearchOperator.OR to combine terms
             search_titles: Whether to search session titles
             search_content: Whether to search message content
             date_range: Optional tuple of (start_date, end_date) to filter by
+            limit: Maximum number of sessions to return, None for all
+            offset: Number of matching sessions to skip, for pagination
         """
         ...
 
@@ -61,7 +91,11 @@ class StorageInterface(ABC):
     def get_active_sessions_by_date_range(
         self, start_date: datetime, end_date: datetime
     ) -> List[ChatSession]:
-        """Get sessions that have messages within the date range"""
+        """Get sessions that have messages within the date range
+
+        Implementations should check message timestamps through an index on
+        (session_id, timestamp), so the probe per session is a range lookup.
+        """
         ...
 
     @abstractmethod
@@ -79,10 +113,29 @@ class StorageInterface(ABC):
         """Get a specific chat session"""
         ...
 
+    def get_sessions(self, session_ids: Iterable[str]) -> Dict[str, ChatSession]:
+        """Get several chat sessions at once, keyed by session id
+
+        Sessions are returned in the order requested and ids with no matching
+        session are left out. Implementations should override this to fetch the
+        batch in a single query.
+        """
+        sessions = {}
+        for session_id in session_ids:
+            try:
+                sessions[session_id] = self.get_session(session_id)
+            except ValueError:
+                continue
+        return sessions
+
     @abstractmethod
     def delete_message(self, session_id: str, index: int) -> None:
         """Delete a specific message by its index.
 
+        Message indexes stay contiguous: later messages in the session shift
+        down by one. Callers assign new indexes as len(messages), so leaving a
+        gap would collide with an existing index on the next save.
+
         Args:
             session_id: ID of the session containing the message
             index: Index of the message to delete
@@ -108,7 +161,11 @@ class StorageInterface(ABC):
     def get_recent_sessions(
         self, limit: int = 10, include_private=False
     ) -> List[ChatSession]:
-        """Get most recently active sessions"""
+        """Get most recently active sessions
+
+        Implementations should index sessions by last_active so the newest
+        sessions are read in order without sorting the whole table.
+        """
         ...
 
     @abstractmethod
@@ -133,7 +190,7 @@ class StorageInterface(ABC):
         """Get the current default template
 
         Returns:
-            The default template if one is set, None otherwise
+            The default template if one is set, raises ValueError otherwise
         """
         ...
 
@@ -1,9 +1,14 @@
 # rocktalk/services/bedrock.py
 import os
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 import boto3
+from botocore.config import Config
 from mypy_boto3_bedrock.literals import (
     FoundationModelLifecycleStatusType,
     InferenceTypeType,
@@ -16,7 +21,7 @@ from mypy_boto3_bedrock.type_defs import (
 )
 from utils.log import logger
 
-from .creds import get_cached_aws_credentials
+from .creds import AwsCredentials, get_cached_aws_credentials
 
 # Known maximum output tokens for specific models
 # These values are approximate and may change; always refer to the latest documentation
@@ -33,21 +38,167 @@ KNOWN_MAX_OUTPUT_TOKENS: Dict[str, int] = {
     "mistral.mistral-large-2407-v1:0": 32768,
 }
 
+# Fallback maximum output tokens by "provider.family" prefix, so new dated or
+# versioned releases of a known family don't drop to the default
+_MAX_TOKENS_BY_FAMILY: Dict[str, int] = {
+    "anthropic.claude-3-7-sonnet": 64_000,
+    "anthropic.claude-3-5-sonnet": 8192,
+    "anthropic.claude-3-5-haiku": 8192,
+    "anthropic.claude-3-sonnet": 4096,
+    "anthropic.claude-3-haiku": 4096,
+    "anthropic.claude-3-opus": 4096,
+    "anthropic.claude-v2": 4096,
+    "anthropic.claude-instant": 4096,
+    "amazon.titan-text-express": 8192,
+    "cohere.command-text": 4096,
+    "meta.llama3-1-70b-instruct": 4096,
+    "mistral.mistral-large": 32768,
+}
+
+# Longest prefix first so e.g. "claude-3-7-sonnet" wins over a shorter family
+_MAX_TOKENS_PREFIXES: Tuple[Tuple[str, int], ...] = tuple(
+    sorted(_MAX_TOKENS_BY_FAMILY.items(), key=lambda item: len(item[0]), reverse=True)
+)
+
 DEFAULT_MAX_OUTPUT_TOKENS: int = 4096
 
+# Seconds to reuse a list_foundation_models response; the catalog rarely changes
+MODEL_LIST_TTL: float = 300.0
+
+# Control-plane calls retry throttling with client-side rate adaptation and
+# fail fast on unreachable endpoints instead of stalling the UI
+BEDROCK_CLIENT_CONFIG = Config(
+    retries={"mode": "adaptive", "max_attempts": 10},
+    connect_timeout=3,
+    read_timeout=10,
+)
+
+# Runs list_foundation_models off the script thread so the request can be started
+# at app init and overlap with rendering instead of blocking the settings dialog
+_MODEL_LIST_EXECUTOR = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="bedrock-models"
+)
+
+
+@lru_cache(maxsize=8)
+def _bedrock_runtime_client(
+    region_name: str,
+    aws_access_key_id: Optional[str] = None,
+    aws_secret_access_key: Optional[str] = None,
+    aws_session_token: Optional[str] = None,
+) -> Any:
+    """Create a bedrock-runtime client, cached per region and credentials"""
+    return boto3.client(
+        "bedrock-runtime",
+        region_name=region_name,
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        aws_session_token=aws_session_token,
+    )
+
+
+def _credential_args(creds: Optional[AwsCredentials]) -> Tuple[Optional[str], ...]:
+    """Unwrap credentials into hashable client cache key arguments"""
+    if not creds:
+        return ()
+    return (
+        creds.aws_access_key_id.get_secret_value(),
+        creds.aws_secret_access_key.get_secret_value(),
+        (
+            creds.aws_session_token.get_secret_value()
+            if creds.aws_session_token
+            else None
+        ),
+    )
+
+
+@lru_cache(maxsize=8)
+def _bedrock_client(
+    region_name: str,
+    aws_access_key_id: Optional[str] = None,
+    aws_secret_access_key: Optional[str] = None,
+    aws_session_token: Optional[str] = None,
+) -> Any:
+    """Create a bedrock control-plane client, cached per region and credentials"""
+    return boto3.client(
+        "bedrock",
+        region_name=region_name,
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        aws_session_token=aws_session_token,
+        config=BEDROCK_CLIENT_CONFIG,
+    )
+
+
+def get_bedrock_client(region_name: str, creds: Optional[AwsCredentials] = None) -> Any:
+    """Get a shared bedrock (control-plane) client.
 
-@dataclass
+    Args:
+        region_name: AWS region for the client
+        creds: Credentials from Streamlit secrets, or None to let boto3 manage
+            credentials
+
+    Returns:
+        boto3 bedrock client
+    """
+    return _bedrock_client(region_name, *_credential_args(creds))
+
+
+def get_bedrock_runtime_client(
+    region_name: str, creds: Optional[AwsCredentials] = None
+) -> Any:
+    """Get a shared bedrock-runtime client.
+
+    Building a boto3 client loads the botocore service model and resolves
+    credentials, so clients are created once per region/credentials pair and
+    reused across LLM config updates.
+
+    Args:
+        region_name: AWS region for the client
+        creds: Credentials from Streamlit secrets, or None to let boto3 manage
+            credentials
+
+    Returns:
+        boto3 bedrock-runtime client
+    """
+    return _bedrock_runtime_client(region_name, *_credential_args(creds))
+
+
+def clear_bedrock_clients() -> None:
+    """Drop the shared Bedrock clients.
+
+    Clients built from the default credential chain keep the credentials they
+    resolved at creation, so they are rebuilt to pick up rotated keys or
+    renewed session tokens.
+    """
+    _bedrock_runtime_client.cache_clear()
+    _bedrock_client.cache_clear()
+
+
+def _frozen(values: Optional[Iterable[str]]) -> Optional[FrozenSet[Any]]:
+    """Freeze an optional API list for O(1) membership checks, keeping None"""
+    return None if values is None else frozenset(values)
+
+
+@dataclass(slots=True, frozen=True)
 class FoundationModelSummary:
     bedrock_model_id: str
     provider_name: Optional[str] = None
     model_name: Optional[str] = None
     model_arn: Optional[str] = None
-    input_modalities: Optional[List[ModelModalityType]] = None
-    output_modalities: Optional[List[ModelModalityType]] = None
+    input_modalities: Optional[FrozenSet[ModelModalityType]] = None
+    output_modalities: Optional[FrozenSet[ModelModalityType]] = None
     response_streaming_supported: Optional[bool] = None
-    customizations_supported: Optional[List[ModelCustomizationType]] = None
-    inference_types_supported: Optional[List[InferenceTypeType]] = None
+    customizations_supported: Optional[FrozenSet[ModelCustomizationType]] = None
+    inference_types_supported: Optional[FrozenSet[InferenceTypeType]] = None
     model_lifecycle: Optional[FoundationModelLifecycleStatusType] = None
+    # (provider, model id) ordering key, computed once per instance
+    sort_key: Tuple[str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "sort_key", (self.provider_name or "", self.bedrock_model_id)
+        )
 
     @classmethod
     def from_dict(cls, data: FoundationModelSummaryTypeDef) -> "FoundationModelSummary":
@@ -56,64 +207,78 @@ class FoundationModelSummary:
             provider_name=data.get("providerName"),
             model_name=data.get("modelName"),
             model_arn=data.get("modelArn"),
-            input_modalities=data.get("inputModalities"),
-            output_modalities=data.get("outputModalities"),
+            input_modalities=_frozen(data.get("inputModalities")),
+            output_modalities=_frozen(data.get("outputModalities")),
             response_streaming_supported=data.get("responseStreamingSupported"),
-            customizations_supported=data.get("customizationsSupported"),
-            inference_types_supported=data.get("inferenceTypesSupported"),
+            customizations_supported=_frozen(data.get("customizationsSupported")),
+            inference_types_supported=_frozen(data.get("inferenceTypesSupported")),
             model_lifecycle=data.get("modelLifecycle", dict()).get("status"),
         )
 
 
 class BedrockService:
+    # (expires_at, pending or finished request) per region/credentials, shared
+    # across instances
+    _model_list_cache: Dict[
+        tuple, Tuple[float, "Future[List[FoundationModelSummary]]"]
+    ] = {}
+
     def __init__(self):
         creds = get_cached_aws_credentials()
         region_name = (
             creds.aws_region if creds else os.getenv("AWS_REGION", "us-west-2")
         )
-        if creds:
-            # Use credentials from Streamlit secrets
-            self.client = boto3.client(
-                "bedrock",
-                region_name=region_name,
-                aws_access_key_id=creds.aws_access_key_id.get_secret_value(),
-                aws_secret_access_key=creds.aws_secret_access_key.get_secret_value(),
-                aws_session_token=(
-                    creds.aws_session_token.get_secret_value()
-                    if creds.aws_session_token
-                    else None
-                ),
-            )
-        else:
-            # Let boto3 manage credentials
-            self.client = boto3.client(
-                "bedrock",
-                region_name=region_name,
-            )
+        # Use credentials from Streamlit secrets, or let boto3 manage them
+        self.client = get_bedrock_client(region_name, creds)
+        self._cache_key = (region_name, *_credential_args(creds))
+
+    def _fetch_foundation_models(self) -> List[FoundationModelSummary]:
+        """Call Bedrock for the foundation model list, sorted by provider and id"""
+        response: ListFoundationModelsResponseTypeDef = (
+            self.client.list_foundation_models()
+        )
+        models = []
+
+        for model_summary in response["modelSummaries"]:
+            model = FoundationModelSummary.from_dict(model_summary)
+            models.append(model)
+        # Sort models by provider and name
+        models.sort(key=attrgetter("sort_key"))
+        return models
+
+    def prefetch_foundation_models(self) -> "Future[List[FoundationModelSummary]]":
+        """Start fetching the model list in the background.
+
+        Reuses an in-flight request or a result younger than MODEL_LIST_TTL.
+
+        Returns:
+            Future resolving to the sorted model list
+        """
+        cached = self._model_list_cache.get(self._cache_key)
+        if cached and (not cached[1].done() or cached[0] > time.monotonic()):
+            return cached[1]
+
+        future = _MODEL_LIST_EXECUTOR.submit(self._fetch_foundation_models)
+        self._model_list_cache[self._cache_key] = (
+            time.monotonic() + MODEL_LIST_TTL,
+            future,
+        )
+        return future
 
     def list_foundation_models(self) -> List[FoundationModelSummary]:
-        """Get list of available foundation models from Bedrock."""
+        """Get list of available foundation models from Bedrock.
+
+        Successful responses are reused for MODEL_LIST_TTL seconds. Errors
+        (e.g. expired credentials or throttling after retries) are logged and
+        re-raised so callers can surface them.
+        """
         try:
-            response: ListFoundationModelsResponseTypeDef = (
-                self.client.list_foundation_models()
-            )
-            models = []
-
-            for model_summary in response["modelSummaries"]:
-                model = FoundationModelSummary.from_dict(model_summary)
-                models.append(model)
-            # Sort models by provider and name
-            return sorted(
-                models,
-                key=lambda x: (
-                    x.provider_name if x.provider_name else "",
-                    x.bedrock_model_id,
-                ),
-            )
-
-        except Exception as e:
-            logger.error(f"Error fetching models: {str(e)}")
-            return []
+            return list(self.prefetch_foundation_models().result())
+        except Exception:
+            # Don't keep failures around; the next call retries
+            self._model_list_cache.pop(self._cache_key, None)
+            logger.exception("Error fetching models")
+            raise
 
     @staticmethod
     def get_compatible_models() -> List[FoundationModelSummary]:
@@ -122,13 +287,22 @@ class BedrockService:
         models = service.list_foundation_models()
 
         # Filter for models that:
+        # - Are in ACTIVE state
         # - Support text output
         # - Support streaming
-        # - Are in ACTIVE state
         # - Support ON_DEMAND inference
+        # The lifecycle check comes first since it rejects the most models
         compatible_models = []
         for model in models:
-            if model.output_modalities is None:
+            if model.model_lifecycle is None:
+                logger.debug(
+                    f"Model {model.bedrock_model_id} skipped: No lifecycle status specified"
+                )
+            elif model.model_lifecycle != "ACTIVE":
+                logger.debug(
+                    f"Model {model.bedrock_model_id} skipped: Not in ACTIVE state"
+                )
+            elif model.output_modalities is None:
                 logger.debug(
                     f"Model {model.bedrock_model_id} skipped: No output modalities specified"
                 )
@@ -140,14 +314,6 @@ class BedrockService:
                 logger.debug(
                     f"Model {model.bedrock_model_id} skipped: Does not support streaming"
                 )
-            elif model.model_lifecycle is None:
-                logger.debug(
-                    f"Model {model.bedrock_model_id} skipped: No lifecycle status specified"
-                )
-            elif model.model_lifecycle != "ACTIVE":
-                logger.debug(
-                    f"Model {model.bedrock_model_id} skipped: Not in ACTIVE state"
-                )
             elif model.inference_types_supported is None:
                 logger.debug(
                     f"Model {model.bedrock_model_id} skipped: No inference types specified"
@@ -193,14 +359,15 @@ class BedrockService:
             return KNOWN_MAX_OUTPUT_TOKENS[bedrock_model_id]
 
         # If no exact match, try matching without region prefix
-        normalized_id = bedrock_model_id.split(".")[
-            -2:
-        ]  # Get last two parts (e.g., 'claude-3-sonnet-20250219-v1:0')
-        if normalized_id:
-            normalized_id = ".".join(normalized_id)
-            for known_id in KNOWN_MAX_OUTPUT_TOKENS:
-                if known_id.endswith(normalized_id):
-                    return KNOWN_MAX_OUTPUT_TOKENS[known_id]
+        # (e.g. 'us.anthropic.claude-3-sonnet-20240229-v1:0')
+        normalized_id = ".".join(bedrock_model_id.split(".")[-2:])
+        if normalized_id in KNOWN_MAX_OUTPUT_TOKENS:
+            return KNOWN_MAX_OUTPUT_TOKENS[normalized_id]
+
+        # Then fall back to the model family, ignoring date/version suffixes
+        for prefix, max_tokens in _MAX_TOKENS_PREFIXES:
+            if normalized_id.startswith(prefix):
+                return max_tokens
 
         # If still no match, return default
         return DEFAULT_MAX_OUTPUT_TOKENS
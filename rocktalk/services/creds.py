@@ -70,7 +70,12 @@ def get_aws_credentials(
     return None
 
 
+@st.cache_resource(show_spinner=False)
 def get_cached_aws_credentials() -> Optional[AwsCredentials]:
-    """Return AwsCredentials from Streamlit secrets, if present. Credentials from other sources are not cached."""
+    """Return AwsCredentials from Streamlit secrets, if present. Credentials from other sources are not cached.
+
+    The lookup is cached across reruns, call get_cached_aws_credentials.clear()
+    to pick up changed secrets.
+    """
     credentials = get_aws_credentials()
     return credentials
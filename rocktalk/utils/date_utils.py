@@ -2,18 +2,43 @@ from datetime import datetime
 from typing import List, Tuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from models.interfaces import ChatSession
 
+from .datetime_utils import to_epoch_micros
 from .log import logger
 
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
+def _localized(datetimes: List[datetime], tzinfo: ZoneInfo) -> pd.DatetimeIndex:
+    """Convert session datetimes to a DatetimeIndex in the given timezone
+
+    Goes through integer epoch microseconds so pandas builds the index from an
+    int64 array instead of inferring and converting each datetime object.
+    """
+    micros = np.fromiter(
+        map(to_epoch_micros, datetimes), dtype=np.int64, count=len(datetimes)
+    )
+    return pd.to_datetime(micros, unit="us", utc=True).tz_convert(tzinfo)
+
+
+def _utc_datetime64(dt: datetime) -> np.datetime64:
+    """Convert an aware datetime to the UTC datetime64 pandas stores it as"""
+    return pd.Timestamp(dt).to_datetime64()
+
+
+def _months_before(month_start: datetime, months: int) -> datetime:
+    """Start of the month the given number of months before month_start"""
+    year, month = divmod(month_start.year * 12 + month_start.month - 1 - months, 12)
+    return month_start.replace(year=year, month=month + 1)
+
+
 def create_date_masks(
     recent_sessions: List[ChatSession],
-) -> Tuple[List[Tuple[str, pd.Series]], pd.DataFrame]:
+) -> Tuple[List[Tuple[str, np.ndarray]], pd.DataFrame]:
     """Creates time-based masks for a DataFrame containing session data.
     Groups sessions into:
     - Today (MM/DD/YYYY)
@@ -35,15 +60,20 @@ def create_date_masks(
         except Exception:
             tzinfo = ZoneInfo("UTC")
 
-    df_sessions = pd.DataFrame([session.model_dump() for session in recent_sessions])
-
-    # Parse datetime columns and set them as timezone-aware in UTC
-    df_sessions["last_active"] = pd.to_datetime(df_sessions["last_active"], utc=True)
-    df_sessions["created_at"] = pd.to_datetime(df_sessions["created_at"], utc=True)
-
-    # Convert to user's timezone
-    df_sessions["last_active"] = df_sessions["last_active"].dt.tz_convert(tzinfo)
-    df_sessions["created_at"] = df_sessions["created_at"].dt.tz_convert(tzinfo)
+    # Only the columns the sidebar renders and groups by; dumping whole sessions
+    # would serialize every session's LLMConfig just to discard it
+    df_sessions = pd.DataFrame(
+        {
+            "session_id": [session.session_id for session in recent_sessions],
+            "title": [session.title for session in recent_sessions],
+            "created_at": _localized(
+                [session.created_at for session in recent_sessions], tzinfo
+            ),
+            "last_active": _localized(
+                [session.last_active for session in recent_sessions], tzinfo
+            ),
+        }
+    )
 
     # Get 'now' in the user's local timezone
     now = datetime.now(tzinfo)
@@ -54,32 +84,33 @@ def create_date_masks(
     month_start = today_start.replace(day=1)
     year_ago = today_start - pd.DateOffset(years=1)
 
+    # Masks compare the underlying UTC datetime64 array directly, without a
+    # pandas Series dispatch per comparison
+    last_active = df_sessions["last_active"].values
     masks = []
-    already_grouped = pd.Series(False, index=df_sessions.index)
+    # Groups are checked newest first and each one covers everything from its
+    # start onwards, so later groups are cut off at the earliest start so far
+    # rather than masked against the groups before them.
+    grouped_start = _utc_datetime64(today_start)
 
     # Today's sessions
-    today_mask = df_sessions["last_active"] >= today_start
+    today_mask = last_active >= grouped_start
     if today_mask.any():
         today_label = f"Today ({today_start.strftime('%a %b %d')})"
         masks.append((today_label, today_mask))
-        already_grouped |= today_mask
 
     # Yesterday's sessions
-    yesterday_mask = (
-        (df_sessions["last_active"] >= yesterday_start)
-        & (df_sessions["last_active"] < today_start)
-        & ~already_grouped
+    yesterday_mask = (last_active >= _utc_datetime64(yesterday_start)) & (
+        last_active < grouped_start
     )
     if yesterday_mask.any():
         yesterday_label = f"Yesterday ({yesterday_start.strftime('%a %b %d')})"
         masks.append((yesterday_label, yesterday_mask))
-        already_grouped |= yesterday_mask
+    grouped_start = _utc_datetime64(yesterday_start)
 
     # This week's sessions (excluding today and yesterday)
-    week_mask = (
-        (df_sessions["last_active"] >= week_start)
-        & (df_sessions["last_active"] < yesterday_start)
-        & ~already_grouped
+    week_mask = (last_active >= _utc_datetime64(week_start)) & (
+        last_active < grouped_start
     )
     if week_mask.any():
         day_before_yesterday = yesterday_start - pd.Timedelta(days=1)
@@ -96,41 +127,37 @@ def create_date_masks(
         )
         week_label = f"Past Week ({week_start_formatted} - {week_end_formatted})"
         masks.append((week_label, week_mask))
-        already_grouped |= week_mask
+    grouped_start = _utc_datetime64(week_start)
 
     # This month's sessions (excluding already grouped sessions)
-    month_mask = (
-        (df_sessions["last_active"] >= month_start)
-        & (df_sessions["last_active"] < today_start)
-        & ~already_grouped
+    month_mask = (last_active >= _utc_datetime64(month_start)) & (
+        last_active < grouped_start
     )
     if month_mask.any():
         month_label = f"Earlier This Month ({month_start.strftime('%b %Y')})"
         masks.append((month_label, month_mask))
-        already_grouped |= month_mask
+    grouped_start = min(grouped_start, _utc_datetime64(month_start))
 
-    # Create masks for previous 11 months
-    for i in range(1, 12):
-        period_end = month_start - pd.DateOffset(months=i - 1)
-        period_start = month_start - pd.DateOffset(months=i)
+    # Create masks for previous 11 months, newest first
+    month_starts = [_months_before(month_start, i) for i in range(12)]
+    for period_end, period_start in zip(month_starts, month_starts[1:]):
         month_label = period_start.strftime("%b %Y")
+        period_start64 = _utc_datetime64(period_start)
 
-        month_mask = (
-            (df_sessions["last_active"] >= period_start)
-            & (df_sessions["last_active"] < period_end)
-            & ~already_grouped
+        month_mask = (last_active >= period_start64) & (
+            last_active < min(_utc_datetime64(period_end), grouped_start)
         )
 
         # Always append the month even if empty to maintain consistency
         masks.append((month_label, month_mask))
-        if month_mask.any():
-            already_grouped |= month_mask
+        grouped_start = min(grouped_start, period_start64)
 
     # Over a year ago
-    older_mask = (df_sessions["last_active"] < year_ago) & ~already_grouped
+    older_mask = last_active < min(_utc_datetime64(year_ago), grouped_start)
     if older_mask.any():
-        oldest_date = df_sessions[older_mask]["last_active"].min()
-        newest_date = df_sessions[older_mask]["last_active"].max()
+        older_last_active = df_sessions["last_active"][older_mask]
+        oldest_date = older_last_active.min()
+        newest_date = older_last_active.max()
         older_label = f"Over a year ago ({oldest_date.strftime('%m/%d/%Y')} - {newest_date.strftime('%m/%d/%Y')})"
         masks.append((older_label, older_mask))
 
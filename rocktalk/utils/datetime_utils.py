@@ -1,9 +1,13 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f%z"  # Updated to include timezone offset
 DATE_FORMAT = "%Y-%m-%d"
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
 
 def format_datetime(dt: Optional[datetime] = None) -> str:
     """Format a datetime object to string using standard format.
@@ -23,16 +27,28 @@ def format_datetime(dt: Optional[datetime] = None) -> str:
     return dt.strftime(DATETIME_FORMAT)
 
 
+@lru_cache(maxsize=8192)
 def parse_datetime(dt_string: str) -> datetime:
     """Parse a datetime string in our standard format.
     Handles both timezone-aware and naive datetime strings.
 
+    Results are cached since the same stored timestamps are parsed on every
+    rerun; datetime objects are immutable so sharing them is safe.
+
     Args:
         dt_string: String representation of datetime
 
     Returns:
         datetime object
     """
+    try:
+        # fromisoformat is implemented in C and accepts our standard format
+        dt = datetime.fromisoformat(dt_string)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    except ValueError:
+        pass
     try:
         # Try parsing with microseconds and timezone info
         return datetime.strptime(dt_string, "%Y-%m-%d %H:%M:%S.%f%z")
@@ -55,3 +71,34 @@ def parse_datetime(dt_string: str) -> datetime:
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt
+
+
+def to_epoch_micros(dt: Optional[datetime] = None) -> int:
+    """Convert a datetime to integer microseconds since the Unix epoch.
+    If no datetime provided, uses current time. Uses integer arithmetic so
+    the conversion round-trips exactly through from_epoch_micros.
+
+    Args:
+        dt: datetime object
+
+    Returns:
+        Microseconds since 1970-01-01 00:00:00 UTC
+    """
+    if dt is None:
+        dt = datetime.now(timezone.utc)
+    elif dt.tzinfo is None:
+        # Assume naive datetime is UTC
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // MICROSECOND
+
+
+def from_epoch_micros(micros: int) -> datetime:
+    """Convert integer microseconds since the Unix epoch to a UTC datetime.
+
+    Args:
+        micros: Microseconds since 1970-01-01 00:00:00 UTC
+
+    Returns:
+        Timezone-aware datetime object in UTC
+    """
+    return EPOCH + timedelta(microseconds=micros)
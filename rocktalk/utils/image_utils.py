@@ -1,12 +1,15 @@
 import base64
+from functools import lru_cache
 from io import BytesIO
+from typing import TYPE_CHECKING
 
-from PIL import Image, ImageFile
+if TYPE_CHECKING:
+    from PIL import Image, ImageFile
 
 MAX_IMAGE_WIDTH: int = 300
 
 
-def image_from_b64_image(b64_image: str) -> ImageFile.ImageFile:
+def image_from_b64_image(b64_image: str) -> "ImageFile.ImageFile":
     """Convert a base64-encoded image string to a PIL Image object.
 
     Args:
@@ -14,7 +17,28 @@ def image_from_b64_image(b64_image: str) -> ImageFile.ImageFile:
     Returns:
         ImageFile.ImageFile: PIL Image object.
     """
+    from PIL import Image
 
     image_data: bytes = base64.b64decode(b64_image)
     image: ImageFile.ImageFile = Image.open(BytesIO(image_data))
     return image
+
+
+@lru_cache(maxsize=64)
+def thumbnail_from_b64_image(b64_image: str) -> "Image.Image":
+    """Decode a base64-encoded image and downscale it for display in the chat.
+
+    Results are cached so historical images aren't decoded again on every
+    Streamlit rerun. The returned image is shared and must not be modified.
+
+    Args:
+        b64_image (str): Base64-encoded image string.
+    Returns:
+        Image.Image: PIL Image no wider than MAX_IMAGE_WIDTH.
+    """
+    from PIL import Image
+
+    image: Image.Image = image_from_b64_image(b64_image)
+    # Bounded by its own height, so only the width constrains the downscale
+    image.thumbnail((MAX_IMAGE_WIDTH, image.height), Image.Resampling.BILINEAR)
+    return image
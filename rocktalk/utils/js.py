@@ -3,7 +3,6 @@ import json
 import streamlit as st
 import streamlit.components.v1 as stcomponents
 from streamlit_javascript import st_javascript
-from streamlit_js_eval import streamlit_js_eval
 
 from .log import logger
 
@@ -222,19 +221,9 @@ def find_iframe_js():
     """
 
 
-def expand_button_height(target_key: str):
-    return
-    target_key = json.dumps(f".st-key-{target_key} button")
-    streamlit_js_eval(
-        js_expressions=f"""
-    {find_iframe_js()}
-
-    findIFrameFunction('expandButton')({target_key});
-    """
-    )
-
-
 def copy_value_to_clipboard(value: str):
+    from streamlit_js_eval import streamlit_js_eval
+
     value = json.dumps(value)
     # with stylized_container("copy_to_clipboard_boo"):
     streamlit_js_eval(
@@ -13,6 +13,21 @@ USER_LOG_LEVEL = os.getenv("ROCKTALK_LOG_LEVEL", "INFO").upper()
 BASE_LOG_LEVEL = logging.DEBUG
 
 
+class LogBufferHandler(MemoryHandler):
+    """MemoryHandler that keeps only the latest records for the log viewer
+
+    MemoryHandler only clears its buffer when flushing to a target. With no
+    target, every record logged was kept for the life of the process.
+    """
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            del self.buffer[: -self.capacity]
+        finally:
+            self.release()
+
+
 def setup_logger(log_level: str = USER_LOG_LEVEL) -> logging.Logger:
     # Configure logging
     logger = logging.getLogger("rocktalk")
@@ -57,7 +72,7 @@ def setup_logger(log_level: str = USER_LOG_LEVEL) -> logging.Logger:
         logger.addHandler(console_handler)
 
         # Add memory handler
-        memory_handler = MemoryHandler(capacity=1000, flushLevel=logging.ERROR)
+        memory_handler = LogBufferHandler(capacity=1000, flushLevel=logging.ERROR)
         memory_handler.setFormatter(formatter)
         memory_handler.setLevel(BASE_LOG_LEVEL)
         logger.addHandler(memory_handler)
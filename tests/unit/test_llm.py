@@ -167,3 +167,69 @@ def test_error_handling(mock_langchain_bedrock, temp_database):
     with pytest.raises(Exception) as exc_info:
         llm.invoke([message.convert_to_llm_message()])
     assert "Test error" in str(exc_info.value)
+
+
+def test_refresh_credentials_rebuilds_client(temp_database):
+    """Test refreshing credentials replaces the shared default-chain client"""
+    from rocktalk.services.bedrock import clear_bedrock_clients
+
+    clear_bedrock_clients()
+    with (
+        mock.patch("boto3.client", side_effect=lambda *a, **kw: mock.MagicMock()),
+        mock.patch("rocktalk.models.llm.get_cached_aws_credentials", return_value=None),
+        mock.patch("rocktalk.models.llm.ChatBedrockConverse") as mock_chat,
+    ):
+        mock_chat.side_effect = lambda **kw: mock.MagicMock(
+            client=kw["client"], model_id=kw["model"]
+        )
+        llm = BedrockLLM(storage=temp_database)
+        original_llm = llm._llm
+        original_client = original_llm.client
+
+        # A config update alone reuses the cached client and LLM instance
+        llm.update_config(llm.get_config())
+        assert llm._llm is original_llm
+
+        llm.refresh_credentials(llm.get_config())
+        assert llm._llm is not original_llm
+        assert llm._llm.client is not original_client
+        assert llm._title_llm.client is llm._llm.client
+
+    clear_bedrock_clients()
+
+
+@pytest.mark.parametrize("thinking_supported", [False, True])
+def test_convert_messages_uses_llm_thinking_support(
+    temp_database, test_session, thinking_supported
+):
+    """Test that conversion follows the converting LLM's thinking support"""
+    temp_database.store_session(test_session)
+    temp_database.save_message(
+        ChatMessage.create(
+            session_id=test_session.session_id,
+            role="assistant",
+            content=[
+                ChatContentItem(thinking="Let me think...", thinking_signature="sig"),
+                ChatContentItem(text="Done thinking"),
+            ],
+            index=0,
+            created_at=datetime(2024, 1, 1, 12, 1, 0, tzinfo=timezone.utc),
+        )
+    )
+
+    with (
+        mock.patch("boto3.client"),
+        mock.patch("rocktalk.models.llm.get_cached_aws_credentials", return_value=None),
+        mock.patch("rocktalk.models.llm.ChatBedrockConverse"),
+    ):
+        llm = BedrockLLM(storage=temp_database)
+
+    # No app context in session state: the flag comes from this LLM
+    with mock.patch.object(
+        llm, "is_thinking_supported", return_value=thinking_supported
+    ):
+        messages = llm.convert_messages_to_llm_format(test_session)
+
+    content_types = [block["type"] for block in messages[-1].content]
+    expected = ["thinking", "text"] if thinking_supported else ["text"]
+    assert content_types == expected
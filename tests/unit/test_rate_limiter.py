@@ -0,0 +1,95 @@
+from unittest import mock
+
+import pytest
+
+from rocktalk.models.llm import BedrockLLM
+from rocktalk.models.rate_limiter import TokenRateLimiter
+
+
+@pytest.fixture
+def clock():
+    """Patch the rate limiter's monotonic clock with a manually advanced one"""
+
+    class Clock:
+        now = 1000.0
+
+        def advance(self, seconds):
+            self.now += seconds
+
+    fake_clock = Clock()
+    with mock.patch(
+        "rocktalk.models.rate_limiter.time.monotonic",
+        side_effect=lambda: fake_clock.now,
+    ):
+        yield fake_clock
+
+
+def test_window_total_matches_live_entries(clock):
+    """Test that the running total equals the sum of unexpired entries"""
+    limiter = TokenRateLimiter(tokens_per_minute=1000)
+
+    for tokens in (100, 200, 300):
+        limiter.update_usage(tokens)
+        clock.advance(25)
+
+    # The first entry is now 75 seconds old and has left the window
+    assert limiter.get_current_usage() == 500
+    assert limiter.get_current_usage() == sum(t for _, t in limiter.usage_window)
+    assert limiter.get_usage_percentage() == 50
+
+    # Expiry also happens when recording and checking usage
+    clock.advance(30)
+    limiter.update_usage(50)
+    assert [t for _, t in limiter.usage_window] == [300, 50]
+    assert limiter.get_current_usage() == 350
+
+    clock.advance(61)
+    assert limiter.check_rate_limit(0) == (True, 0)
+    assert limiter.get_current_usage() == 0
+    assert not limiter.usage_window
+
+
+def test_blocks_at_limit_until_oldest_entry_expires(clock):
+    """Test that requests over the limit wait for the oldest entry to expire"""
+    limiter = TokenRateLimiter(tokens_per_minute=1000)
+    limiter.update_usage(600)
+    clock.advance(20)
+    limiter.update_usage(300)
+
+    # Up to the limit is allowed, one token over is not
+    assert limiter.check_rate_limit(100) == (True, 0)
+    allowed, wait_time = limiter.check_rate_limit(101)
+    assert not allowed
+    assert wait_time == pytest.approx(40)
+
+    # Still blocked just before the oldest entry leaves the window
+    clock.advance(wait_time - 1)
+    allowed, wait_time = limiter.check_rate_limit(101)
+    assert not allowed
+    assert wait_time == pytest.approx(1)
+
+    # Allowed once it has expired
+    clock.advance(wait_time + 0.001)
+    assert limiter.check_rate_limit(101) == (True, 0)
+    assert limiter.get_current_usage() == 300
+
+
+def test_pause_for_rate_limit_sleeps_for_wait_time(clock):
+    """Test that the LLM pauses for the limiter's wait time at the limit"""
+    llm = mock.MagicMock()
+    llm._config.bedrock_model_id = "amazon.titan-text-express-v1"
+    llm._estimate_tokens.return_value = 100
+    llm._rate_limiter = TokenRateLimiter(tokens_per_minute=1000)
+
+    with (
+        mock.patch("rocktalk.models.llm.st"),
+        mock.patch("rocktalk.models.llm.time.sleep") as sleep,
+    ):
+        # 200 estimated tokens fit under the limit
+        BedrockLLM.pause_for_rate_limit(llm, [])
+        sleep.assert_not_called()
+
+        llm._rate_limiter.update_usage(900)
+        clock.advance(15)
+        BedrockLLM.pause_for_rate_limit(llm, [])
+        sleep.assert_called_once_with(pytest.approx(45))
@@ -1,5 +1,7 @@
 import json
+import sqlite3
 from datetime import datetime, timedelta, timezone
+from functools import partial
 
 import pytest
 
@@ -9,7 +11,12 @@ from rocktalk.models.interfaces import (
     ChatSession,
     LLMConfig,
 )
-from rocktalk.models.storage.storage_interface import SearchOperator
+from rocktalk.models.storage.sqlite import SQLiteChatStorage
+from rocktalk.models.storage.storage_interface import (
+    SearchOperator,
+    StorageInterface,
+)
+from rocktalk.utils.datetime_utils import format_datetime, from_epoch_micros
 
 
 def test_create_session(temp_database, test_session):
@@ -162,3 +169,489 @@ def test_session_privacy(temp_database, test_session):
     sessions = temp_database.get_recent_sessions(include_private=True)
     assert len(sessions) == 1
     assert sessions[0].session_id == test_session.session_id
+
+
+def _create_v3_database(db_path, sessions, messages):
+    """Create a schema version 3 database holding the given sessions and messages
+
+    Version 3 predates the FTS indexes and stores timestamps as ISO 8601 text.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE sessions (
+            session_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            last_active TIMESTAMP NOT NULL,
+            config TEXT NOT NULL,
+            is_private BOOLEAN NOT NULL DEFAULT 0,
+            input_tokens_used INTEGER NOT NULL DEFAULT 0,
+            output_tokens_used INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE TABLE messages (
+            message_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            message_index INTEGER NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            FOREIGN KEY (session_id) REFERENCES sessions(session_id),
+            UNIQUE(session_id, message_index)
+        );
+
+        CREATE TABLE templates (
+            template_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            description TEXT NOT NULL,
+            config TEXT NOT NULL,
+            is_default BOOLEAN NOT NULL DEFAULT 0
+        );
+
+        CREATE TABLE schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at TIMESTAMP NOT NULL
+        );
+        """
+    )
+    conn.executemany(
+        "INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
+        [(version, format_datetime()) for version in range(4)],
+    )
+    conn.executemany(
+        "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                session.session_id,
+                session.title,
+                format_datetime(session.created_at),
+                format_datetime(session.last_active),
+                session.config.model_dump_json(),
+                session.is_private,
+                session.input_tokens_used,
+                session.output_tokens_used,
+            )
+            for session in sessions
+        ],
+    )
+    conn.executemany(
+        """
+        INSERT INTO messages
+        (session_id, role, content, message_index, timestamp)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                message.session_id,
+                message.role,
+                message.serialize_message_content(),
+                message.index,
+                format_datetime(message.created_at),
+            )
+            for message in messages
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _fts_rows(storage, table, session_id):
+    """Return the indexed text for a session from an FTS table"""
+    column = "title" if table == "sessions_fts" else "body"
+    with storage.get_connection() as conn:
+        cursor = conn.execute(
+            f"SELECT {column} FROM {table} WHERE session_id = ? ORDER BY rowid",
+            (session_id,),
+        )
+        return [row[0] for row in cursor]
+
+
+def test_fts_backfill_on_migration(tmp_path, test_session, test_messages):
+    """Test that migrating to the FTS schema indexes existing sessions"""
+    db_path = str(tmp_path / "chat_database.db")
+    _create_v3_database(db_path, [test_session], test_messages)
+
+    storage = SQLiteChatStorage(db_path=db_path)
+    try:
+        assert _fts_rows(storage, "sessions_fts", test_session.session_id) == [
+            test_session.title
+        ]
+        bodies = _fts_rows(storage, "messages_fts", test_session.session_id)
+        assert [body.strip() for body in bodies] == [
+            message.content[0].text for message in test_messages
+        ]
+
+        results = storage.search_sessions(["thank you"])
+        assert [s.session_id for s in results] == [test_session.session_id]
+    finally:
+        storage.close()
+
+
+def test_fts_triggers_sync(temp_database, test_session, test_messages):
+    """Test that inserts, updates and deletes keep the FTS tables in sync"""
+    session_id = test_session.session_id
+    temp_database.store_session(test_session)
+    for message in test_messages:
+        temp_database.save_message(message)
+
+    # Inserts are indexed
+    assert _fts_rows(temp_database, "sessions_fts", session_id) == ["Test Session"]
+    assert len(_fts_rows(temp_database, "messages_fts", session_id)) == 2
+
+    # Renames and content updates replace the indexed text
+    temp_database.rename_session(session_id, "Renamed Session")
+    with temp_database.get_connection(write=True) as conn:
+        conn.execute(
+            """
+            UPDATE messages SET content = ?
+            WHERE session_id = ? AND message_index = 0
+            """,
+            (json.dumps([{"text": "Goodbye for now"}]), session_id),
+        )
+    assert _fts_rows(temp_database, "sessions_fts", session_id) == ["Renamed Session"]
+    assert not temp_database.search_sessions(["Test Session"])
+    assert not temp_database.search_sessions(["Hello"])
+    assert len(temp_database.search_sessions(["Goodbye"])) == 1
+
+    # Deletes remove the indexed text
+    temp_database.delete_message(session_id, 0)
+    assert len(_fts_rows(temp_database, "messages_fts", session_id)) == 1
+    assert not temp_database.search_sessions(["Goodbye"])
+
+    temp_database.delete_session(session_id)
+    assert _fts_rows(temp_database, "sessions_fts", session_id) == []
+    assert _fts_rows(temp_database, "messages_fts", session_id) == []
+
+
+def test_search_titles_and_content(temp_database, test_session, test_messages):
+    """Test restricting search to titles or to message content"""
+    temp_database.store_session(test_session)
+    for message in test_messages:
+        temp_database.save_message(message)
+
+    # "Session" only appears in the title, "Hello" only in a message
+    assert len(temp_database.search_sessions(["Session"], search_content=False)) == 1
+    assert len(temp_database.search_sessions(["Session"], search_titles=False)) == 0
+    assert len(temp_database.search_sessions(["Hello"], search_content=False)) == 0
+    assert len(temp_database.search_sessions(["Hello"], search_titles=False)) == 1
+
+    # Searching neither matches nothing
+    assert not temp_database.search_sessions(
+        ["Hello"], search_titles=False, search_content=False
+    )
+
+
+def test_search_sessions_pagination(temp_database, test_session):
+    """Test paging through search results with limit and offset"""
+    base_time = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    session_ids = []
+    for i in range(5):
+        session = test_session.model_copy(
+            update={"session_id": f"session-{i}", "title": f"Paged Session {i}"}
+        )
+        temp_database.store_session(session)
+        temp_database.save_message(
+            ChatMessage.create(
+                session_id=session.session_id,
+                role="user",
+                content=[ChatContentItem(text=f"message {i}")],
+                index=0,
+                created_at=base_time + timedelta(hours=i),
+            )
+        )
+        session_ids.append(session.session_id)
+
+    # Results are ordered by most recent message first
+    expected = list(reversed(session_ids))
+    results = temp_database.search_sessions(["Paged"])
+    assert [s.session_id for s in results] == expected
+
+    pages = [
+        temp_database.search_sessions(["Paged"], limit=2, offset=offset)
+        for offset in (0, 2, 4)
+    ]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [s.session_id for page in pages for s in page] == expected
+    assert not temp_database.search_sessions(["Paged"], limit=2, offset=5)
+
+
+@pytest.mark.parametrize(
+    "term, in_title, in_content",
+    [
+        # Terms shorter than a trigram
+        ("ok", False, True),
+        ("C", True, True),
+        # LIKE and SQL quoting characters
+        ("50%", False, True),
+        ("off_now", False, True),
+        ("it's", False, True),
+        ('"quoted"', False, True),
+        ("C++", True, False),
+        ("'; DROP TABLE sessions; --", False, False),
+        # Multi-byte characters, including runs shorter than a trigram
+        ("wö", True, False),
+        ("漢", False, True),
+        ("漢字", False, True),
+        ("字 ok", False, False),
+    ],
+)
+def test_search_special_terms(temp_database, test_session, term, in_title, in_content):
+    """Test search terms with special or multi-byte characters and short terms"""
+    session = test_session.model_copy(update={"title": "C++ tips from wörld"})
+    temp_database.store_session(session)
+    temp_database.save_message(
+        ChatMessage.create(
+            session_id=session.session_id,
+            role="user",
+            content=[
+                ChatContentItem(text="It's 50% off_now, ok? \"quoted\" 漢字 C")
+            ],
+            index=0,
+            created_at=datetime(2024, 1, 1, 12, 1, 0, tzinfo=timezone.utc),
+        )
+    )
+
+    title_results = temp_database.search_sessions([term], search_content=False)
+    content_results = temp_database.search_sessions([term], search_titles=False)
+    assert len(title_results) == int(in_title)
+    assert len(content_results) == int(in_content)
+    assert len(temp_database.search_sessions([term])) == int(in_title or in_content)
+
+    # The sessions table is untouched
+    assert len(temp_database.get_recent_sessions()) == 1
+
+
+def test_integer_timestamp_migration(tmp_path, monkeypatch, temp_database):
+    """Test migrating ISO 8601 text timestamps to integer epoch microseconds"""
+    base_time = datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    config = LLMConfig(bedrock_model_id="anthropic.claude-3-sonnet-20240229-v1:0")
+    sessions = []
+    messages = []
+    for i in range(3):
+        # Mix UTC offsets to check that conversion normalizes them
+        created_at = (base_time + timedelta(days=i)).astimezone(
+            timezone(timedelta(hours=i - 1))
+        )
+        session = ChatSession(
+            session_id=f"session-{i}",
+            title=f"Session {i}",
+            created_at=created_at,
+            last_active=created_at,
+            config=config,
+        )
+        sessions.append(session)
+        for index in range(2):
+            message = ChatMessage.create(
+                session_id=session.session_id,
+                role="user",
+                content=[ChatContentItem(text=f"Message {index}")],
+                index=index,
+                created_at=created_at + timedelta(minutes=index + 1, microseconds=7),
+            )
+            messages.append(message)
+
+    # Bring the database to version 7, which still stores ISO 8601 text
+    db_path = str(tmp_path / "chat_database.db")
+    _create_v3_database(db_path, sessions, messages)
+    monkeypatch.setattr(SQLiteChatStorage, "CURRENT_SCHEMA_VERSION", 7)
+    SQLiteChatStorage(db_path=db_path).close()
+    monkeypatch.undo()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT MAX(version) FROM schema_version").fetchone() == (7,)
+    assert conn.execute(
+        "SELECT DISTINCT typeof(created_at) FROM sessions"
+    ).fetchall() == [("text",)]
+    conn.close()
+
+    storage = SQLiteChatStorage(db_path=db_path)
+    try:
+        # Stored values are integers that convert back to the original instants
+        with storage.get_connection() as conn:
+            for session in sessions:
+                created_at, last_active = conn.execute(
+                    """
+                    SELECT created_at, last_active FROM sessions
+                    WHERE session_id = ?
+                    """,
+                    (session.session_id,),
+                ).fetchone()
+                assert isinstance(created_at, int)
+                assert from_epoch_micros(created_at) == session.created_at
+                assert from_epoch_micros(last_active) == session.last_active
+
+        migrated = storage.get_messages("session-1")
+        originals = [m for m in messages if m.session_id == "session-1"]
+        assert [m.created_at for m in migrated] == [m.created_at for m in originals]
+
+        # Queries match a database written with integer timestamps from the start
+        for session in sessions:
+            temp_database.store_session(session)
+        temp_database.save_messages(messages)
+
+        def session_ids(results):
+            return [s.session_id for s in results]
+
+        assert session_ids(storage.get_recent_sessions()) == session_ids(
+            temp_database.get_recent_sessions()
+        )
+        for start, end, expected in (
+            (base_time, base_time + timedelta(days=1), {"session-0"}),
+            (
+                base_time + timedelta(hours=12),
+                base_time + timedelta(days=3),
+                {"session-1", "session-2"},
+            ),
+            (base_time - timedelta(days=1), base_time, set()),
+        ):
+            results = session_ids(storage.get_active_sessions_by_date_range(start, end))
+            assert set(results) == expected
+            assert results == session_ids(
+                temp_database.get_active_sessions_by_date_range(start, end)
+            )
+    finally:
+        storage.close()
+
+
+def test_delete_session_cascades(temp_database, test_session, test_messages):
+    """Test that deleting a session removes its messages and FTS rows only"""
+    other_session = test_session.model_copy(
+        update={"session_id": "other-session-id", "title": "Other Session"}
+    )
+    other_messages = [
+        message.model_copy(update={"session_id": other_session.session_id})
+        for message in test_messages
+    ]
+    for session, messages in (
+        (test_session, test_messages),
+        (other_session, other_messages),
+    ):
+        temp_database.store_session(session)
+        temp_database.save_messages(messages)
+
+    temp_database.delete_session(test_session.session_id)
+
+    with temp_database.get_connection() as conn:
+        for table in ("messages", "messages_fts", "sessions_fts"):
+            cursor = conn.execute(
+                f"SELECT session_id, COUNT(*) FROM {table} GROUP BY session_id"
+            )
+            expected = 1 if table == "sessions_fts" else len(other_messages)
+            assert [tuple(row) for row in cursor] == [
+                (other_session.session_id, expected)
+            ]
+
+    # The other session is untouched
+    remaining = temp_database.get_session(other_session.session_id)
+    assert remaining.title == "Other Session"
+    assert len(temp_database.get_messages(other_session.session_id)) == len(
+        other_messages
+    )
+    assert [s.session_id for s in temp_database.search_sessions(["Hello"])] == [
+        other_session.session_id
+    ]
+
+    # Deleting it again reports the missing session
+    with pytest.raises(ValueError):
+        temp_database.delete_session(test_session.session_id)
+
+
+@pytest.mark.parametrize("use_interface_default", [False, True])
+def test_get_sessions(temp_database, test_session, use_interface_default):
+    """Test fetching several sessions at once"""
+    get_sessions = (
+        partial(StorageInterface.get_sessions, temp_database)
+        if use_interface_default
+        else temp_database.get_sessions
+    )
+    for i in range(3):
+        temp_database.store_session(
+            test_session.model_copy(
+                update={"session_id": f"session-{i}", "title": f"Session {i}"}
+            )
+        )
+
+    # Sessions come back keyed by id in the order requested
+    sessions = get_sessions(["session-2", "session-0", "session-1"])
+    assert list(sessions) == ["session-2", "session-0", "session-1"]
+    assert all(session.session_id == key for key, session in sessions.items())
+    assert sessions["session-2"].title == "Session 2"
+
+    # Missing ids are left out
+    sessions = get_sessions(iter(["missing", "session-1", "also-missing"]))
+    assert list(sessions) == ["session-1"]
+
+    assert get_sessions([]) == {}
+
+
+@pytest.mark.parametrize("use_interface_default", [False, True])
+def test_save_messages_updates_sessions(
+    temp_database, test_session, use_interface_default
+):
+    """Test that bulk saving messages updates each session's count and span"""
+    save_messages = (
+        partial(StorageInterface.save_messages, temp_database)
+        if use_interface_default
+        else temp_database.save_messages
+    )
+    base_time = test_session.created_at
+    offsets = {
+        # One session's messages span two days, the other's two hours
+        "long-session": [timedelta(days=2), timedelta(0), timedelta(hours=1)],
+        "short-session": [timedelta(hours=1), timedelta(hours=2)],
+    }
+    messages = []
+    for session_id, session_offsets in offsets.items():
+        temp_database.store_session(
+            test_session.model_copy(update={"session_id": session_id})
+        )
+        for index, offset in enumerate(session_offsets):
+            messages.append(
+                ChatMessage.create(
+                    session_id=session_id,
+                    role="user",
+                    content=[ChatContentItem(text=f"Message {index}")],
+                    index=index,
+                    created_at=base_time + offset,
+                )
+            )
+
+    # Interleave the sessions' messages in one batch
+    save_messages(sorted(messages, key=lambda message: message.index))
+    save_messages([])
+
+    with temp_database.get_connection() as conn:
+        for session_id, session_offsets in offsets.items():
+            row = conn.execute(
+                """
+                SELECT message_count, first_message, last_message,
+                    long_session, last_active
+                FROM sessions WHERE session_id = ?
+                """,
+                (session_id,),
+            ).fetchone()
+            first = base_time + min(session_offsets)
+            last = base_time + max(session_offsets)
+            assert row["message_count"] == len(session_offsets)
+            assert from_epoch_micros(row["first_message"]) == first
+            assert from_epoch_micros(row["last_message"]) == last
+            assert from_epoch_micros(row["last_active"]) == last
+            assert row["long_session"] == (session_id == "long-session")
+
+    assert len(temp_database.get_messages("long-session")) == 3
+    assert len(temp_database.get_messages("short-session")) == 2
+
+
+def test_get_default_template(temp_database):
+    """Test getting the default template and the error when none is set"""
+    default = temp_database.get_default_template()
+    assert default.template_id in {
+        template.template_id for template in temp_database.get_chat_templates()
+    }
+
+    with temp_database.get_connection(write=True) as conn:
+        conn.execute("UPDATE templates SET is_default = 0")
+
+    with pytest.raises(ValueError):
+        temp_database.get_default_template()